@@ -0,0 +1,47 @@
+# benchmarks/bench_backends.py
+#
+# Speed table for the JSON and YAML backends that are importable here. Their consistency
+# is checked by tests/test_backends.py.
+# Run with: python benchmarks/bench_backends.py
+
+import timeit
+
+from jh_decorators.reflection import Jsonize, YAMLize, available_backends
+
+CALLS = 5_000
+
+
+@Jsonize
+@YAMLize
+class Record:
+    id: int
+    name: str
+    price: float
+    tags: list
+
+    def __init__(self, id, name, price, tags):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.tags = tags
+
+
+def per_call_us(func) -> float:
+    return min(timeit.repeat(func, number=CALLS, repeat=3)) / CALLS * 1e6
+
+
+def main() -> None:
+    print(f"{'backend':<16}{'dumps us':>12}{'loads us':>12}")
+    for format, decorator, dump_name, load_name in (('json', Jsonize, 'to_json', 'from_json'),
+                                                    ('yaml', YAMLize, 'to_yaml', 'from_yaml')):
+        for name in available_backends(format):
+            cls = decorator(backend=name)(type(f'Record_{name}', (Record,), {}))
+            instance = cls(42, 'widget', 9.99, ['a', 'b', 'c'])
+            text = getattr(instance, dump_name)()
+            dumps = per_call_us(getattr(instance, dump_name))
+            loads = per_call_us(lambda: getattr(cls, load_name)(text))
+            print(f"{format + '/' + name:<16}{dumps:>12.2f}{loads:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
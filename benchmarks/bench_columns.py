@@ -0,0 +1,67 @@
+# benchmarks/bench_columns.py
+#
+# Records <-> columns for a Dictize class: the hand-written path (to_dict in a loop, then
+# transpose; from_dict per row) compared with to_columns/from_columns.
+# Run with: python benchmarks/bench_columns.py [rows ...]   (default: 10000 1000000 10000000)
+# 10M rows need several GB of memory for the instances alone.
+
+import sys
+import time
+
+from jh_decorators.reflection import Dictize
+
+SIZES = [int(arg) for arg in sys.argv[1:]] or [10_000, 1_000_000, 10_000_000]
+
+
+@Dictize(slots=True)
+class Trade:
+    id: int
+    price: float
+    quantity: int
+    is_buy: bool
+
+    def __init__(self, id, price, quantity, is_buy):
+        self.id = id
+        self.price = price
+        self.quantity = quantity
+        self.is_buy = is_buy
+
+
+def loop_to_columns(trades):
+    dicts = [trade.to_dict() for trade in trades]
+    return {name: [d[name] for d in dicts] for name in dicts[0]}
+
+
+def loop_from_columns(columns):
+    names = list(columns)
+    return [Trade.from_dict(dict(zip(names, row))) for row in zip(*columns.values())]
+
+
+def timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    print(f"{'rows':>12}{'direction':>16}{'loop s':>10}{'list s':>10}{'array s':>10}{'speedup':>10}")
+    for rows in SIZES:
+        trades = [Trade(i, i * 0.5, i % 100, i % 2 == 0) for i in range(rows)]
+
+        loop_seconds, columns = timed(lambda: loop_to_columns(trades))
+        list_seconds, _ = timed(lambda: Trade.to_columns(trades))
+        array_seconds, arrays = timed(lambda: Trade.to_columns(trades, kind='array'))
+        print(f"{rows:>12,}{'to columns':>16}{loop_seconds:>10.2f}{list_seconds:>10.2f}{array_seconds:>10.2f}"
+              f"{loop_seconds / list_seconds:>9.1f}x")
+        del trades
+
+        loop_seconds, _ = timed(lambda: loop_from_columns(columns))
+        list_seconds, _ = timed(lambda: Trade.from_columns(columns))
+        array_seconds, _ = timed(lambda: Trade.from_columns(arrays))
+        print(f"{rows:>12,}{'from columns':>16}{loop_seconds:>10.2f}{list_seconds:>10.2f}{array_seconds:>10.2f}"
+              f"{loop_seconds / list_seconds:>9.1f}x")
+        del columns, arrays
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_generate_api.py
+#
+# Regenerating the stubs of a package of many modules: rendering and rewriting every module,
+# compared with generate_package_api on a cold cache, a warm cache, and after editing one
+# module. Each scenario runs in a fresh interpreter, as a build step would.
+# Run with: python benchmarks/bench_generate_api.py [modules]
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+MODULES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+PACKAGE = 'bench_stub_package'
+
+MODULE_SOURCE = '''\
+from typing import List
+from jh_decorators.documentation import Annotation
+from jh_decorators.reflection import Dictize, Jsonize
+
+
+@Annotation(args=[('values', 'numbers to add')], return_doc='the sum')
+def total(values: List[int]) -> int:
+    """Add up values."""
+    return sum(values)
+
+
+@Annotation
+@Jsonize
+@Dictize
+class Record{index}:
+    """A record."""
+    id: int
+    name: str
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+    def label(self) -> str:
+        """Describe the record."""
+        return f"{{self.id}}: {{self.name}}"
+'''
+
+# Every module rendered and its stub rewritten, as calling generate_api per module does
+FULL = f'''
+import importlib
+from jh_decorators.documentation import render_api
+for index in range({MODULES}):
+    module = importlib.import_module(f"{PACKAGE}.module_{{index}}")
+    with open(module.__file__[:-3] + '.pyi', 'w') as f:
+        f.write(render_api(module, True))
+'''
+
+PACKAGE_MODE = f'''
+import sys
+from jh_decorators.documentation import generate_package_api
+outcome = generate_package_api({PACKAGE!r}, True, workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
+print(*(f"{{key}}={{len(names)}}" for key, names in outcome.items()))
+'''
+
+
+def run(directory: str, script: str, *arguments: str) -> tuple:
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, os.getcwd()]))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', script, *arguments], env=environment, check=True,
+                            capture_output=True, text=True)
+    return time.perf_counter() - start, result.stdout.strip()
+
+
+def clean(package: str) -> None:
+    for file in os.listdir(package):
+        if file.endswith('.pyi') or file.endswith('.json'):
+            os.remove(os.path.join(package, file))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        package = os.path.join(directory, PACKAGE)
+        os.mkdir(package)
+        open(os.path.join(package, '__init__.py'), 'w').close()
+        for index in range(MODULES):
+            with open(os.path.join(package, f'module_{index}.py'), 'w') as f:
+                f.write(MODULE_SOURCE.format(index=index))
+
+        print(f"{MODULES} modules, {os.cpu_count()} CPU(s)")
+        print(f"{'scenario':<36}{'seconds':>10}  outcome")
+        seconds, _ = run(directory, FULL)
+        print(f"{'render and rewrite every module':<36}{seconds:>10.2f}")
+        clean(package)
+        for label, arguments in (("package, cold cache, 1 process", ('1',)),
+                                 ("package, warm cache", ()),
+                                 ("package, cold cache, process pool", ())):
+            if 'cold' in label:
+                clean(package)
+            seconds, outcome = run(directory, PACKAGE_MODE, *arguments)
+            print(f"{label:<36}{seconds:>10.2f}  {outcome}")
+
+        with open(os.path.join(package, 'module_0.py'), 'a') as f:
+            f.write('\n\ndef added() -> None:\n    pass\n')
+        seconds, outcome = run(directory, PACKAGE_MODE)
+        print(f"{'package, one module edited':<36}{seconds:>10.2f}  {outcome}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_graph.py
+#
+# Encoding a chain of "diamonds": every node references the next node twice. Expanded as
+# a tree the output doubles with every level; with shared=True each node is written once
+# and the output grows linearly with depth.
+# Run with: python benchmarks/bench_graph.py
+
+import time
+from typing import Optional
+
+from jh_decorators.reflection import Jsonize
+
+
+@Jsonize
+class Node:
+    value: int
+    left: Optional['Node']
+    right: Optional['Node']
+
+    def __init__(self, value, left=None, right=None):
+        self.value = value
+        self.left = left
+        self.right = right
+
+
+def diamond_chain(depth: int) -> Node:
+    node = None
+    for value in range(depth):
+        node = Node(value, node, node)
+    return node
+
+
+def timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    print(f"{'depth':>6}{'tree ms':>12}{'tree bytes':>14}{'shared ms':>12}{'shared bytes':>14}")
+    for depth in (8, 12, 16, 100, 200):
+        root = diamond_chain(depth)
+        if depth <= 16:
+            tree_seconds, tree = timed(root.to_json)
+            tree_cells = f"{tree_seconds * 1e3:>12.2f}{len(tree):>14,}"
+        else:
+            tree_cells = f"{'-':>12}{'-':>14}"
+        shared_seconds, shared = timed(lambda: root.to_json(shared=True))
+        rebuilt = Node.from_json(shared)
+        assert rebuilt.left is rebuilt.right
+        print(f"{depth:>6}{tree_cells}{shared_seconds * 1e3:>12.2f}{len(shared):>14,}")
+
+
+if __name__ == "__main__":
+    main()
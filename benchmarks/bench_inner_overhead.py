@@ -0,0 +1,86 @@
+# benchmarks/bench_inner_overhead.py
+#
+# Call overhead of an @Inner function called from another module at growing stack depths,
+# compared with the previous implementation that walked the whole f_back chain on every call.
+# Run with: python benchmarks/bench_inner_overhead.py
+
+import functools
+import sys
+import timeit
+import types
+
+from jh_decorators.interface import Inner
+
+CALLS = 20_000
+
+DEFINING_SOURCE = '''
+def helper():
+    return 1
+
+def run(foreign, depth, target, fresh_frames):
+    return foreign.descend(depth, target, fresh_frames)
+'''
+
+FOREIGN_SOURCE = '''
+def call_once(target):
+    return target()
+
+def descend(depth, target, fresh_frames):
+    if depth > 0:
+        return descend(depth - 1, target, fresh_frames)
+    if fresh_frames:
+        for _ in range(CALLS):
+            call_once(target)
+    else:
+        for _ in range(CALLS):
+            target()
+'''
+
+
+def legacy_inner(func, module_name):
+    """The caller check as it was before the verdict cache."""
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        calling_frame = sys._getframe(1)
+        if calling_frame.f_globals['__name__'] != module_name:
+            current_frame = calling_frame
+            while current_frame:
+                if current_frame.f_globals['__name__'] == module_name:
+                    break
+                current_frame = current_frame.f_back
+            else:
+                raise RuntimeError(f"{func.__name__} is an internal function")
+        return func(*args, **kwargs)
+
+    return wrapped
+
+
+def load_module(name, source):
+    module = types.ModuleType(name)
+    module.CALLS = CALLS
+    sys.modules[name] = module
+    exec(compile(source, name, 'exec'), module.__dict__)
+    return module
+
+
+def main() -> None:
+    defining = load_module('bench_inner_defining', DEFINING_SOURCE)
+    foreign = load_module('bench_inner_foreign', FOREIGN_SOURCE)
+    legacy = legacy_inner(defining.helper, defining.__name__)
+    cached = Inner(defining.helper)
+
+    print(f"{'depth':>6}{'callers':>16}{'before ns/call':>18}{'after ns/call':>18}")
+    for depth in (5, 50, 500):
+        for fresh_frames in (False, True):
+            row = []
+            for target in (legacy, cached):
+                seconds = min(timeit.repeat(lambda: defining.run(foreign, depth, target, fresh_frames),
+                                            number=1, repeat=3))
+                row.append(seconds / CALLS * 1e9)
+            label = "fresh frames" if fresh_frames else "same frame"
+            print(f"{depth:>6}{label:>16}{row[0]:>18.1f}{row[1]:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
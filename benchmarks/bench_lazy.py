@@ -0,0 +1,78 @@
+# benchmarks/bench_lazy.py
+#
+# Reading a few fields out of a wide record: eager from_json/from_dict (every field decoded
+# and the constructor run) compared with lazy proxies (fields decoded on first access)
+# and projected proxies (only the named fields kept).
+# Run with: python benchmarks/bench_lazy.py [fields]
+
+import sys
+import timeit
+import tracemalloc
+from typing import List
+
+from jh_decorators.reflection import Dictize, Jsonize
+
+FIELDS = int(sys.argv[1]) if len(sys.argv) > 1 else 250
+CALLS = 2_000
+READ = ('f0', 'f1', 'f2')
+
+
+@Jsonize
+@Dictize
+class Part:
+    serial: int
+    weight: float
+
+    def __init__(self, serial, weight):
+        self.serial = serial
+        self.weight = weight
+
+
+def wide_class() -> type:
+    annotations = {f'f{i}': (List[Part] if i % 10 == 9 else int) for i in range(FIELDS)}
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    return Jsonize(Dictize(type('Wide', (), {'__annotations__': annotations, '__init__': __init__})))
+
+
+def per_call_us(func) -> float:
+    return min(timeit.repeat(func, number=CALLS, repeat=3)) / CALLS * 1e6
+
+
+def peak_kib(func) -> float:
+    tracemalloc.start()
+    kept = [func() for _ in range(100)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return peak / 100 / 1024
+
+
+def main() -> None:
+    wide = wide_class()
+    data = {f'f{i}': ([{'serial': i, 'weight': 0.5}] * 3 if i % 10 == 9 else i) for i in range(FIELDS)}
+    text = wide(**data).to_json()
+
+    def read(instance) -> int:
+        return sum(getattr(instance, name) for name in READ)
+
+    cases = (("eager from_dict", lambda: wide.from_dict(data)),
+             ("lazy from_dict", lambda: wide.from_dict(data, lazy=True)),
+             ("projected from_dict", lambda: wide.from_dict(data, fields=READ)),
+             ("eager from_json", lambda: wide.from_json(text)),
+             ("lazy from_json", lambda: wide.from_json(text, lazy=True)),
+             ("projected from_json", lambda: wide.from_json(text, fields=READ)))
+
+    print(f"{FIELDS} fields, reading {len(READ)}")
+    print(f"{'loader':<22}{'load+read us':>14}{'KiB/instance':>14}")
+    for label, load in cases:
+        assert read(load()) == read(wide.from_dict(data))
+        seconds = per_call_us(lambda: read(load()))
+        print(f"{label:<22}{seconds:>14.1f}{peak_kib(load):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_packize.py
+#
+# Encoding and decoding a batch of numeric records as JSON Lines (Jsonize) and as packed
+# binary records (Packize), plus the cost of reading one record out of the middle.
+# Run with: python benchmarks/bench_packize.py [records]
+
+import io
+import sys
+import time
+from typing import Annotated
+
+from jh_decorators.reflection import Jsonize, Packize
+
+RECORDS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+@Jsonize
+@Packize
+class Tick:
+    timestamp: int
+    price: float
+    quantity: Annotated[int, 'I']
+    is_buy: bool
+
+    def __init__(self, timestamp, price, quantity, is_buy):
+        self.timestamp = timestamp
+        self.price = price
+        self.quantity = quantity
+        self.is_buy = is_buy
+
+
+def timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    ticks = [Tick(1_700_000_000_000 + i, 100 + i * 0.01, i % 1000, i % 2 == 0) for i in range(RECORDS)]
+
+    def dump_json() -> str:
+        stream = io.StringIO()
+        Tick.dump_jsonl(ticks, stream)
+        return stream.getvalue()
+
+    json_encode, text = timed(dump_json)
+    json_decode, _ = timed(lambda: list(Tick.load_jsonl(io.StringIO(text))))
+    json_random, _ = timed(lambda: Tick.from_json(text.splitlines()[RECORDS // 2]))
+
+    packed_encode, buffer = timed(lambda: Tick.pack_many(ticks))
+    packed_decode, _ = timed(lambda: list(Tick.unpack_many(buffer)))
+    packed_random, _ = timed(lambda: Tick.unpack_many(buffer)[RECORDS // 2])
+
+    print(f"{RECORDS:,} records")
+    print(f"{'format':<10}{'bytes':>14}{'encode s':>10}{'decode s':>10}{'one record us':>16}")
+    print(f"{'JSONL':<10}{len(text.encode()):>14,}{json_encode:>10.2f}{json_decode:>10.2f}{json_random * 1e6:>16.1f}")
+    print(f"{'Packize':<10}{len(buffer):>14,}{packed_encode:>10.2f}{packed_decode:>10.2f}"
+          f"{packed_random * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_progress_overhead.py
+#
+# Per-iteration cost of progress bookkeeping in a tight loop.
+# Run with: python benchmarks/bench_progress_overhead.py
+
+import time
+
+from jh_decorators.performance import ProgressBar
+
+ITEMS = 1_000_000
+
+
+def plain(total=ITEMS):
+    for _ in range(total):
+        pass
+
+
+@ProgressBar
+def per_item_update(total=ITEMS, progress=None, task_id=None):
+    for _ in range(total):
+        progress.update(task_id, advance=1)
+
+
+@ProgressBar(handle=True)
+def handle_advance(total=ITEMS, progress=None, task_id=None):
+    for _ in range(total):
+        progress.advance()
+
+
+@ProgressBar(handle=True, flush_every=10_000, flush_interval=0.25, refresh_per_second=4)
+def handle_advance_coarse(total=ITEMS, progress=None, task_id=None):
+    for _ in range(total):
+        progress.advance()
+
+
+def main() -> None:
+    results = []
+    for label, func in [("plain loop", plain),
+                        ("progress.update per item", per_item_update),
+                        ("handle.advance()", handle_advance),
+                        ("handle.advance(), coarse flush", handle_advance_coarse)]:
+        start = time.perf_counter()
+        func(total=ITEMS)
+        results.append((label, (time.perf_counter() - start) / ITEMS * 1e9))
+
+    baseline = results[0][1]
+    print(f"{'mode':<36}{'ns/item':>12}{'overhead':>12}")
+    for label, cost in results:
+        print(f"{label:<36}{cost:>12.1f}{cost - baseline:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_reflection.py
+#
+# Per-instance cost of to_dict/to_json/from_dict/from_json with the per-class cached
+# serializers, compared with the previous implementation (dict scan with callable() on
+# every value, plus a pass-through __init__ wrapper).
+# Run with: python benchmarks/bench_reflection.py
+
+import json
+import timeit
+from functools import wraps
+
+from jh_decorators.reflection import Dictize, Jsonize
+
+CALLS = 20_000
+
+
+def legacy_reflection(cls):
+    """The Dictize + Jsonize methods as they were before the per-class serializers."""
+    original_init = cls.__init__
+
+    @wraps(original_init)
+    def new_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+
+    def to_dict(self):
+        return {k: v for k, v in self.__dict__.items() if not callable(v)}
+
+    def from_dict(__cls, data):
+        return __cls(**data)
+
+    def to_json(self):
+        return json.dumps({k: v for k, v in self.__dict__.items() if not callable(v)})
+
+    def from_json(__cls, json_str):
+        return __cls(**json.loads(json_str))
+
+    cls.to_dict = to_dict
+    cls.from_dict = classmethod(from_dict)
+    cls.to_json = to_json
+    cls.from_json = classmethod(from_json)
+    cls.__init__ = new_init
+    return cls
+
+
+def make_class(field_count):
+    names = [f"f{i}" for i in range(field_count)]
+    source = (f"def __init__(self, {', '.join(names)}):\n"
+              + "".join(f"    self.{name} = {name}\n" for name in names))
+    namespace = {}
+    exec(source, namespace)
+    return names, namespace['__init__']
+
+
+def per_call_ns(func) -> float:
+    best = min(timeit.repeat(func, number=CALLS, repeat=3))
+    return best / CALLS * 1e9
+
+
+def main() -> None:
+    print(f"{'fields':>7}{'operation':>12}{'before ns':>12}{'after ns':>12}{'speedup':>10}")
+    for field_count in (4, 16, 64):
+        names, init = make_class(field_count)
+        legacy = legacy_reflection(type('Legacy', (), {'__init__': init}))
+        compiled = Dictize(Jsonize(type('Compiled', (), {'__init__': init})))
+        values = {name: i for i, name in enumerate(names)}
+        payload = json.dumps(values)
+
+        for operation in ('to_dict', 'to_json', 'from_dict', 'from_json'):
+            row = []
+            for cls in (legacy, compiled):
+                instance = cls(**values)
+                if operation == 'to_dict':
+                    row.append(per_call_ns(instance.to_dict))
+                elif operation == 'to_json':
+                    row.append(per_call_ns(instance.to_json))
+                elif operation == 'from_dict':
+                    row.append(per_call_ns(lambda: cls.from_dict(values)))
+                else:
+                    row.append(per_call_ns(lambda: cls.from_json(payload)))
+            print(f"{field_count:>7}{operation:>12}{row[0]:>12.1f}{row[1]:>12.1f}{row[0] / row[1]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_slots_memory.py
+#
+# Memory held by 1M instances of a four-field record class: a plain @Dictize class,
+# the same class converted with @Dictize(slots=True), and a hand-written __slots__ class.
+# Also reports to_dict cost per instance for each layout.
+# Run with: python benchmarks/bench_slots_memory.py [instances]
+
+import gc
+import sys
+import timeit
+import tracemalloc
+
+from jh_decorators.reflection import Dictize
+
+INSTANCES = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+@Dictize
+class PlainRecord:
+    id: int
+    name: str
+    price: float
+    quantity: int
+
+    def __init__(self, id, name, price, quantity):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.quantity = quantity
+
+
+@Dictize(slots=True)
+class ConvertedRecord:
+    id: int
+    name: str
+    price: float
+    quantity: int
+
+    def __init__(self, id, name, price, quantity):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.quantity = quantity
+
+
+@Dictize
+class HandSlottedRecord:
+    __slots__ = ('id', 'name', 'price', 'quantity')
+
+    def __init__(self, id, name, price, quantity):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.quantity = quantity
+
+
+def measure(cls) -> tuple:
+    # Field values are shared; totals include the list and one int object per instance
+    name, price = "item", 1.5
+    gc.collect()
+    tracemalloc.start()
+    records = [cls(i, name, price, i) for i in range(INSTANCES)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sample = records[-1]
+    to_dict_ns = min(timeit.repeat(sample.to_dict, number=100_000, repeat=3)) / 100_000 * 1e9
+    del records
+    return current, to_dict_ns
+
+
+def main() -> None:
+    print(f"{INSTANCES:,} instances")
+    print(f"{'layout':<24}{'total MiB':>12}{'bytes/instance':>16}{'to_dict ns':>12}")
+    for label, cls in (("plain __dict__", PlainRecord),
+                       ("Dictize(slots=True)", ConvertedRecord),
+                       ("hand-written __slots__", HandSlottedRecord)):
+        total, to_dict_ns = measure(cls)
+        print(f"{label:<24}{total / 2 ** 20:>12.1f}{total / INSTANCES:>16.1f}{to_dict_ns:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
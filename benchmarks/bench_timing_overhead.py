@@ -0,0 +1,53 @@
+# benchmarks/bench_timing_overhead.py
+#
+# Per-call overhead of Timing and Log in every instrumentation mode.
+# Run with: python benchmarks/bench_timing_overhead.py
+
+import timeit
+
+from jh_decorators.performance import Timing, Log, configure
+
+CALLS = 200_000
+
+
+def bare(x):
+    return x
+
+
+timing_list = Timing([])(bare)
+timing_stats = Timing(stats=True)(bare)
+log_list = Log([])(bare)
+
+
+def per_call_ns(func) -> float:
+    best = min(timeit.repeat(lambda: func(1), number=CALLS, repeat=5))
+    return best / CALLS * 1e9
+
+
+def main() -> None:
+    baseline = per_call_ns(bare)
+    rows = [("bare function", bare, {})]
+    modes = [
+        ("disabled", {'enabled': False}),
+        ("enabled", {'enabled': True}),
+        ("sample 1 in 100", {'enabled': True, 'sample_every': 100}),
+        ("sample every 10 ms", {'enabled': True, 'sample_every': 1, 'sample_interval': 0.01}),
+    ]
+    for label, settings in modes:
+        rows.append((f"Timing(list), {label}", timing_list, settings))
+        rows.append((f"Timing(stats), {label}", timing_stats, settings))
+    rows.append(("Log(list), disabled", log_list, {'enabled': False}))
+    rows.append(("Log(list), enabled", log_list, {'enabled': True}))
+
+    print(f"{'mode':<40}{'ns/call':>12}{'overhead':>12}")
+    for label, func, settings in rows:
+        configure(**{'enabled': True, 'sample_every': 1, 'sample_interval': 0.0, **settings})
+        if isinstance(getattr(func, 'output_obj', None), list):
+            func.output_obj = []
+        cost = per_call_ns(func)
+        print(f"{label:<40}{cost:>12.1f}{cost - baseline:>12.1f}")
+    configure(enabled=True, sample_every=1, sample_interval=0.0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_xml_stream.py
+#
+# Time and peak memory to read a feed of repeated <Item> elements: parsing the whole file
+# with xmltodict and building instances from the result (strings only), compared with
+# XMLize.iter_xml (incremental parsing, values coerced to the annotated types).
+# Run with: python benchmarks/bench_xml_stream.py [items]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import xmltodict
+
+from jh_decorators.reflection import XMLize
+
+ITEMS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+@XMLize
+class Item:
+    id: int
+    name: str
+    price: float
+    in_stock: bool
+
+    def __init__(self, id, name, price, in_stock):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.in_stock = in_stock
+
+
+def write_feed(path: str) -> None:
+    with open(path, 'w') as f:
+        f.write('<feed>\n')
+        for i in range(ITEMS):
+            f.write(f'<Item><id>{i}</id><name>item {i}</name><price>{i * 0.25}</price>'
+                    f'<in_stock>{"true" if i % 2 else "false"}</in_stock></Item>\n')
+        f.write('</feed>\n')
+
+
+def whole_document(path: str) -> int:
+    with open(path, 'rb') as f:
+        items = xmltodict.parse(f)['feed']['Item']
+    return sum(1 for data in items if Item(**data))
+
+
+def streaming(path: str) -> int:
+    return sum(1 for _ in Item.iter_xml(path))
+
+
+def measure(reader, path: str) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = reader(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert count == ITEMS
+    return elapsed, peak
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'feed.xml')
+        write_feed(path)
+        print(f"{ITEMS:,} items, {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+        print(f"{'reader':<32}{'seconds':>10}{'peak MiB':>12}")
+        for label, reader in (("xmltodict.parse + Item(**data)", whole_document),
+                              ("Item.iter_xml (typed)", streaming)):
+            elapsed, peak = measure(reader, path)
+            print(f"{label:<32}{elapsed:>10.2f}{peak / 2 ** 20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
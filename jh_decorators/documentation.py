@@ -2,13 +2,21 @@
 
 import inspect
 import ast
+import concurrent.futures
+import hashlib
+import importlib
+import importlib.util
+import io
+import itertools
+import json
 import os
 import sys
-from typing import Callable, Any, List, Tuple, Union, Type
+import types
+from typing import Callable, Any, Dict, IO, List, Optional, Tuple, Union, Type
 from collections import OrderedDict
 
 from jh_decorators.interface import _inner_items
-from jh_decorators.reflection import dictized_classes, jsonized_classes, xmlized_classes, yamlized_classes
+from jh_decorators.reflection import reflected_classes
 
 annotated_callables: 'OrderedDict[str, Union[Callable[..., Any], Type[Any]]]' = OrderedDict()
 
@@ -54,17 +62,18 @@ def Annotation(*decorator_args: Callable[..., Any],
 
         item.__doc__ = docstring
 
-        # Add to annotated callables
+        # Add to annotated callables, by qualified name so that modules do not collide
+        key = f"{item.__module__}.{item.__qualname__}"
         if inspect.isclass(item):
-            if item.__name__ not in annotated_callables:
-                annotated_callables[item.__name__] = item
+            if key not in annotated_callables:
+                annotated_callables[key] = item
         elif inspect.isfunction(item):
             sig = inspect.signature(item)
             params = list(sig.parameters.values())
             if params and params[0].name == 'self':
                 pass
             else:
-                annotated_callables[item.__name__] = item
+                annotated_callables[key] = item
 
         # Dynamically add Documented decorator
         item = Documented(item)
@@ -91,6 +100,172 @@ def Documented(item: Callable[..., Any]) -> Callable[..., Any]:
     return item
 
 
+# Class methods added by each reflection decorator, written after the methods found on the class
+_REFLECTION_STUBS: List[Tuple[str, List[str]]] = [
+    ('dict', ["from_dict(cls, data: dict, lazy: bool = False, fields=None)",
+              "to_columns(cls, instances, kind: str = 'list') -> dict",
+              "from_columns(cls, columns: dict) -> list"]),
+    ('json', ["from_json(cls, json_str: str, lazy: bool = False, fields=None)",
+              "dump_jsonl(cls, instances, fp, batch_size: int = 1000) -> int",
+              "load_jsonl(cls, fp)"]),
+    ('xml', ["from_xml(cls, xml_str: str)",
+             "iter_xml(cls, source, tag: str = None)"]),
+    ('yaml', ["from_yaml(cls, yaml_str: str)",
+              "dump_yaml_all(cls, instances, fp, batch_size: int = 1000) -> int",
+              "load_yaml_all(cls, fp)"]),
+    ('pack', ["from_bytes(cls, data)",
+              "pack_many(cls, instances) -> bytearray",
+              "unpack_many(cls, buffer)"]),
+]
+
+# Names dropped from the imports of a stub, per module of this package
+_STUB_HIDDEN_IMPORTS: Dict[str, List[str]] = {
+    'jh_decorators.documentation': ['generate_api', 'generate_package_api', 'Annotation'],
+    'jh_decorators.interface': ['Inner', 'update_global', 'get_global'],
+    'jh_decorators.reflection': ['Jsonize', 'Dictize', 'XMLize', 'YAMLize', 'Packize'],
+    'jh_decorators.performance': ['Timing', 'Log', 'ProgressBar'],
+}
+
+
+def _generate_docstring(obj: Callable[..., Any]) -> str:
+    """Generate the docstring for a function or class."""
+    docstring: str = obj.__doc__ or ''
+    return f'    """{docstring}"""\n' if docstring else ''
+
+
+def _write_function(f: IO[str], name: str, obj: Callable[..., Any], documented: bool) -> None:
+    """Write the function signature and docstring to the file."""
+    docstring: str = _generate_docstring(obj)
+    signature: str = str(inspect.signature(obj))
+    if documented:
+        f.write(f"@Documented\n")
+    f.write(f"def {name}{signature}:\n")
+    if docstring:
+        f.write(docstring)
+    f.write("    ...\n\n")
+
+
+def _write_class(f: IO[str], name: str, obj: Any, documented: bool) -> None:
+    """Write the class signature, its methods and the methods added by reflection decorators to the file."""
+    docstring: str = _generate_docstring(obj)
+    if documented:
+        f.write(f"@Documented\n")
+    f.write(f"class {name}:\n")
+    if docstring:
+        f.write(docstring)
+    for method_name, method in inspect.getmembers(obj, inspect.isfunction):
+        signature: str = str(inspect.signature(method))
+        # Remove 'self: Any' from the signature
+        if 'self' in signature:
+            signature = signature.replace('(self: Any', '(self')
+        method_doc: str = _generate_docstring(method)
+        f.write(f"    def {method_name}{signature}:\n")
+        if method_doc:
+            method_doc = method_doc.strip().replace("\n", "\n" + " " * 4)
+            f.write(f'        {method_doc}\n')
+        f.write(" " * 8 + "...\n\n")
+
+    # Check if class has Dictize, Jsonize, XMLize, YAMLize or Packize decorators
+    entry = reflected_classes.get(f"{obj.__module__}.{obj.__qualname__}")
+    formats = entry.formats if entry is not None and entry.cls is obj else set()
+    for format, stubs in _REFLECTION_STUBS:
+        if format in formats:
+            for stub in stubs:
+                f.write("    @classmethod\n")
+                f.write(f"    def {stub}:\n")
+                f.write(" " * 8 + "...\n\n")
+
+
+def _import_statements(source: str) -> List[Union[ast.Import, ast.ImportFrom]]:
+    """The top-level imports of a module source, without the decorators that stubs do not need."""
+    import_statements: List[Union[ast.Import, ast.ImportFrom]] = []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ImportFrom) and node.module in _STUB_HIDDEN_IMPORTS:
+            hidden = _STUB_HIDDEN_IMPORTS[node.module]
+            new_names = [alias for alias in node.names if alias.name not in hidden]
+            if new_names:
+                node.names = new_names
+                import_statements.append(node)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            import_statements.append(node)
+    return import_statements
+
+
+def render_api(module: types.ModuleType, include_unannotated: bool = False, source: Optional[str] = None) -> str:
+    """
+    Render the .pyi stub of an imported module: its imports, then its annotated functions and
+    classes, then, optionally, the unannotated ones.
+
+    Args:
+        module (types.ModuleType): The module to describe.
+        include_unannotated (bool): If True, includes functions without annotations in the stub.
+        source (Optional[str]): The source of the module, if already read; otherwise it is read with inspect.
+
+    Returns:
+        str: The content of the stub.
+    """
+    if source is None:
+        source = inspect.getsource(module)
+    inner = _inner_items.get(module.__name__, [])
+    f = io.StringIO()
+
+    f.write("from jh_decorators.documentation import Documented\n")
+    # Write import statements
+    for stmt in _import_statements(source):
+        if isinstance(stmt, ast.Import):
+            for alias in stmt.names:
+                f.write(f"import {alias.name}")
+                if alias.asname:
+                    f.write(f" as {alias.asname}")
+                f.write("\n")
+        elif isinstance(stmt, ast.ImportFrom):
+            f.write(f"from {'.' * stmt.level}{stmt.module or ''} import ")
+            names = [f"{alias.name}" if alias.asname is None else f"{alias.name} as {alias.asname}" for alias in
+                     stmt.names]
+            f.write(", ".join(names))
+            f.write("\n")
+
+    f.write("\n")
+
+    # Write documented functions and classes
+    annotated = set()
+    for obj in annotated_callables.values():
+        if obj.__module__ != module.__name__:
+            continue
+        annotated.add(obj.__name__)
+        if obj.__name__ in inner:
+            continue
+        if inspect.isfunction(obj):
+            _write_function(f, obj.__name__, obj, True)
+        elif inspect.isclass(obj):
+            _write_class(f, obj.__name__, obj, True)
+
+    # Optionally write unannotated functions and classes
+    if include_unannotated:
+        for name, obj in inspect.getmembers(module):
+            if name in annotated or name in inner or getattr(obj, '__module__', None) != module.__name__:
+                continue
+            if inspect.isfunction(obj):
+                _write_function(f, name, obj, False)
+            elif inspect.isclass(obj):
+                _write_class(f, name, obj, True)
+
+    return f.getvalue()
+
+
+def _write_if_changed(path: str, content: str) -> bool:
+    """Write content to path unless the file already holds it, so unchanged files keep their mtime."""
+    try:
+        with open(path) as f:
+            if f.read() == content:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    with open(path, 'w') as f:
+        f.write(content)
+    return True
+
+
 def generate_api(include_unannotated: bool = False) -> None:
     """
     Generates a .pyi file containing the signatures and docstrings of the annotated functions.
@@ -98,149 +273,132 @@ def generate_api(include_unannotated: bool = False) -> None:
     Args:
         include_unannotated (bool): If True, includes functions without annotations in the generated file.
     """
-
-    def generate_docstring(__obj: Callable[..., Any]) -> str:
-        """Generate the docstring for a function or class."""
-        docstring: str = __obj.__doc__ or ''
-        return f'    """{docstring}"""\n' if docstring else ''
-
-    def write_function(_f: Any, __name: str, __obj: Callable[..., Any], documented: bool) -> None:
-        """Write the function signature and docstring to the file."""
-        docstring: str = generate_docstring(__obj)
-        signature: str = str(inspect.signature(__obj))
-        if documented:
-            _f.write(f"@Documented\n")
-        _f.write(f"def {__name}{signature}:\n")
-        if docstring:
-            _f.write(docstring)
-        _f.write("    ...\n\n")
-
-    def write_class(_f: Any, __name: str, __obj: Any, documented: bool,
-                    __has_dictize: bool, __has_jsonize: bool, __has_xmlize: bool, __has_yamlize: bool) -> None:
-        """Write the class signature and its methods to the file."""
-        docstring: str = generate_docstring(__obj)
-        if documented:
-            _f.write(f"@Documented\n")
-        _f.write(f"class {__name}:\n")
-        if docstring:
-            _f.write(docstring)
-        for method_name, method in inspect.getmembers(__obj, inspect.isfunction):
-            signature: str = str(inspect.signature(method))
-            # Remove 'self: Any' from the signature
-            if 'self' in signature:
-                signature = signature.replace('(self: Any', '(self')
-            method_doc: str = generate_docstring(method)
-            _f.write(f"    def {method_name}{signature}:\n")
-            if method_doc:
-                method_doc = method_doc.strip().replace("\n", "\n" + " " * 4)
-                _f.write(f'        {method_doc}\n')
-            _f.write(" " * 8 + "...\n\n")
-        if __has_dictize:
-            _f.write("    @classmethod\n")
-            _f.write("    def from_dict(cls, data: dict):\n")
-            _f.write(" " * 8 + "...\n\n")
-        if __has_jsonize:
-            _f.write("    @classmethod\n")
-            _f.write("    def from_json(cls, json_str: str):\n")
-            _f.write(" " * 8 + "...\n\n")
-        if __has_xmlize:
-            _f.write("    @classmethod\n")
-            _f.write("    def from_xml(cls, xml_str: str):\n")
-            _f.write(" " * 8 + "...\n\n")
-        if __has_yamlize:
-            _f.write("    @classmethod\n")
-            _f.write("    def from_yaml(cls, yaml_str: str):\n")
-            _f.write(" " * 8 + "...\n\n")
-
-    def get_reflections():
-        # Check if class has Dictize, Jsonize, XMLize, or YAMLize decorators
-        _has_dictize = name in dictized_classes.get(obj.__module__, [])
-        _has_jsonize = name in jsonized_classes.get(obj.__module__, [])
-        _has_xmlize = name in xmlized_classes.get(obj.__module__, [])
-        _has_yamlize = name in yamlized_classes.get(obj.__module__, [])
-
-        return _has_dictize, _has_jsonize, _has_xmlize, _has_yamlize
-
     # Get the current module
     module = sys.modules['__main__']
-    module_file = module.__file__
-    module_name = os.path.splitext(os.path.basename(module_file))[0]
-    output_file = f"{module_name}.pyi"
+    module_name = os.path.splitext(os.path.basename(module.__file__))[0]
+    _write_if_changed(f"{module_name}.pyi", render_api(module, include_unannotated))
+
+
+def _package_modules(package: str, locations: List[str]) -> List[Tuple[str, str]]:
+    """Names and paths of the modules of a package and its regular subpackages, found without importing them."""
+    modules: List[Tuple[str, str]] = []
+    for location in locations:
+        for directory, subdirectories, files in os.walk(location):
+            relative = os.path.relpath(directory, location)
+            prefix = package if relative == os.curdir else f"{package}.{relative.replace(os.sep, '.')}"
+            # Only descend into regular packages
+            subdirectories[:] = sorted(name for name in subdirectories if name.isidentifier()
+                                       and os.path.isfile(os.path.join(directory, name, '__init__.py')))
+            for file in sorted(files):
+                stem, extension = os.path.splitext(file)
+                if extension == '.py' and stem.isidentifier():
+                    modules.append((prefix if stem == '__init__' else f"{prefix}.{stem}",
+                                    os.path.join(directory, file)))
+    return modules
+
+
+def _renderer_fingerprint(include_unannotated: bool) -> str:
+    """
+    Hash of everything besides a module's own source that shapes its stub: the options, the
+    Python version and the jh_decorators sources, which define the decorators and the layout.
+    """
+    digest = hashlib.sha256(repr((include_unannotated, sys.version_info[:2])).encode())
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for file in sorted(os.listdir(directory)):
+        if file.endswith('.py'):
+            with open(os.path.join(directory, file), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _stub_state(path: str) -> Optional[List[int]]:
+    """Size and mtime of a stub, to notice stubs edited or deleted since they were generated."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _render_module(name: str, source: str, include_unannotated: bool) -> Tuple[str, str, Optional[str]]:
+    """Import a module and render its stub; runs in the worker processes of generate_package_api."""
+    try:
+        return name, render_api(importlib.import_module(name), include_unannotated, source), None
+    except Exception as error:
+        return name, '', f"{type(error).__name__}: {error}"
+
+
+def generate_package_api(package: str, include_unannotated: bool = False, cache_file: Optional[str] = None,
+                         workers: Optional[int] = None) -> Dict[str, List[str]]:
+    """
+    Generates a .pyi file next to every module of a package and its subpackages.
 
-    # Read the source code of the module to find import statements
-    module_source = inspect.getsource(module)
-    module_ast = ast.parse(module_source)
+    A module is skipped when its source, the options and the jh_decorators version all match
+    the on-disk cache of the previous run and its stub is untouched. The other modules are
+    imported and rendered in a process pool, and a stub is only rewritten when its content
+    changed, so unchanged stubs keep their mtime.
 
-    import_statements: List[Union[ast.Import, ast.ImportFrom]] = []
-    for node in module_ast.body:
-        if isinstance(node, (ast.Import, ast.ImportFrom)):
-            match node:
-                case ast.ImportFrom(module='jh_decorators.documentation'):
-                    # Replace Annotation with Documented and skip generate_api
-                    new_names = [alias for alias in node.names if alias.name not in ['generate_api', 'Annotation']]
-                    if new_names:
-                        node.names = new_names
-                        import_statements.append(node)
-                case ast.ImportFrom(module='jh_decorators.interface'):
-                    # Skip Inner, update_global and get_global
-                    new_names = [alias for alias in node.names if alias.name
-                                 not in ['Inner', 'update_global', 'get_global']]
-                    if new_names:
-                        node.names = new_names
-                        import_statements.append(node)
-                case ast.ImportFrom(module='jh_decorators.reflection'):
-                    # Skip Jsonize, Dictize, XMLize and YAMLize
-                    new_names = [alias for alias in node.names if alias.name
-                                 not in ['Jsonize', 'Dictize', 'XMLize', 'YAMLize']]
-                    if new_names:
-                        node.names = new_names
-                        import_statements.append(node)
-                case ast.ImportFrom(module='jh_decorators.performance'):
-                    # Skip Timing, Log and ProgressBar
-                    new_names = [alias for alias in node.names if
-                                 alias.name not in ['Timing', 'Log', 'ProgressBar']]
-                    if new_names:
-                        node.names = new_names
-                        import_statements.append(node)
-                case _:
-                    import_statements.append(node)
-
-    with open(output_file, 'w') as f:
-        f.write("from jh_decorators.documentation import Documented\n")
-        # Write import statements
-        for stmt in import_statements:
-            if isinstance(stmt, ast.Import):
-                for alias in stmt.names:
-                    f.write(f"import {alias.name}")
-                    if alias.asname:
-                        f.write(f" as {alias.asname}")
-                    f.write("\n")
-            elif isinstance(stmt, ast.ImportFrom):
-                f.write(f"from {stmt.module} import ")
-                names = [f"{alias.name}" if alias.asname is None else f"{alias.name} as {alias.asname}" for alias in
-                         stmt.names]
-                f.write(", ".join(names))
-                f.write("\n")
+    Args:
+        package (str): Name of an importable package.
+        include_unannotated (bool): If True, includes functions without annotations in the generated files.
+        cache_file (Optional[str]): Path of the cache. Defaults to '.generate_api_cache.json' in the package directory.
+        workers (Optional[int]): Number of worker processes, os.cpu_count() by default. With 1, or a single
+            module to render, the modules are rendered in this process.
 
-        f.write("\n")
-
-        # Write documented functions and classes
-        for name, obj in annotated_callables.items():
-            if inspect.isfunction(obj) and obj.__module__ == module.__name__ and name not in _inner_items.get(
-                    module.__name__, []):
-                write_function(f, name, obj, True)
-            elif inspect.isclass(obj) and obj.__module__ == module.__name__ and name not in _inner_items.get(
-                    module.__name__, []):
-                write_class(f, name, obj, True, *get_reflections())
-
-        # Optionally write unannotated functions and classes
-        if include_unannotated:
-            for name, obj in inspect.getmembers(module):
-                if inspect.isfunction(
-                        obj) and name not in annotated_callables and obj.__module__ == module.__name__ and \
-                        name not in _inner_items.get(module.__name__, []):
-                    write_function(f, name, obj, False)
-                elif inspect.isclass(
-                        obj) and name not in annotated_callables and obj.__module__ == module.__name__ and \
-                        name not in _inner_items.get(module.__name__, []):
-                    write_class(f, name, obj, True, *get_reflections())
+    Returns:
+        Dict[str, List[str]]: Module names by outcome: 'cached' (skipped), 'written', 'unchanged'
+            (rendered to the same content) and 'failed' (import or rendering error, printed).
+
+    Raises:
+        ValueError: If package is not a package.
+    """
+    spec = importlib.util.find_spec(package)
+    if spec is None or not spec.submodule_search_locations:
+        raise ValueError(f"Not a package: {package!r}")
+    locations = list(spec.submodule_search_locations)
+    if cache_file is None:
+        cache_file = os.path.join(locations[0], '.generate_api_cache.json')
+
+    fingerprint = _renderer_fingerprint(include_unannotated)
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+        entries: Dict[str, Dict[str, Any]] = cache['modules'] if cache.get('fingerprint') == fingerprint else {}
+    except (FileNotFoundError, ValueError, KeyError, AttributeError):
+        entries = {}
+
+    outcome: Dict[str, List[str]] = {'cached': [], 'written': [], 'unchanged': [], 'failed': []}
+    modules: Dict[str, Dict[str, Any]] = {}
+    stale: Dict[str, Tuple[str, str, str]] = {}
+    for name, path in _package_modules(package, locations):
+        with open(path, 'rb') as f:
+            data = f.read()
+        source_hash = hashlib.sha256(data).hexdigest()
+        stub_path = os.path.splitext(path)[0] + '.pyi'
+        entry = entries.get(name)
+        if entry is not None and entry.get('source') == source_hash and entry.get('stub') == _stub_state(stub_path):
+            modules[name] = entry
+            outcome['cached'].append(name)
+        else:
+            stale[name] = (importlib.util.decode_source(data), source_hash, stub_path)
+
+    names = list(stale)
+    sources = [stale[name][0] for name in names]
+    if len(names) > 1 and workers != 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_render_module, names, sources, itertools.repeat(include_unannotated)))
+    else:
+        results = list(map(_render_module, names, sources, itertools.repeat(include_unannotated)))
+
+    for name, content, error in results:
+        if error is not None:
+            print(f"generate_package_api: {name}: {error}", file=sys.stderr)
+            outcome['failed'].append(name)
+            continue
+        _, source_hash, stub_path = stale[name]
+        outcome['written' if _write_if_changed(stub_path, content) else 'unchanged'].append(name)
+        modules[name] = {'source': source_hash, 'stub': _stub_state(stub_path)}
+
+    _write_if_changed(cache_file, json.dumps({'fingerprint': fingerprint, 'modules': modules},
+                                             indent=1, sort_keys=True) + '\n')
+    return outcome
@@ -1,18 +1,110 @@
 # jh_decorators/interface.py
 
+import os
 import sys
 import functools
-from typing import Callable, Any, Dict, List, cast
+import itertools
+import warnings
+from types import CodeType, FrameType
+from typing import Callable, Any, Dict, List, Optional, cast
 
 # Record all internal items in all modules
 _inner_items: Dict[str, List[str]] = {}
 
+_frame_getter = cast(Callable[[int], FrameType], getattr(sys, '_getframe'))
+
+# Enforcement policies for Inner, read from the environment at import time, e.g.
+# JH_DECORATORS_INNER_POLICY="enforce,mypackage.hot_path=off,mypackage.api=audit"
+INNER_POLICIES = ('enforce', 'audit', 'off')
+_inner_policies: Dict[str, str] = {}
+_inner_audit_every: int = 100
+
+# Calls to internal items from outside their module, counted in audit mode
+_inner_violations: Dict[str, int] = {}
+
+
+def set_inner_policy(policy: str, module: Optional[str] = None, audit_every: Optional[int] = None) -> None:
+    """
+    Select how Inner enforces access for items decorated from now on.
+
+    Args:
+        policy (str): "enforce" raises on every call from outside the module, "audit" checks one
+            call in `audit_every` and counts violations instead of raising, and "off" leaves items unwrapped.
+        module (Optional[str]): The module or package the policy applies to. If omitted, it becomes the default.
+        audit_every (Optional[int]): How many calls pass between two checks in audit mode.
+
+    Raises:
+        ValueError: If the policy is unknown or audit_every is smaller than 1.
+    """
+    global _inner_audit_every
+    if policy not in INNER_POLICIES:
+        raise ValueError(f"Unknown Inner policy: {policy}")
+    if audit_every is not None:
+        if audit_every < 1:
+            raise ValueError("audit_every must be at least 1")
+        _inner_audit_every = audit_every
+    _inner_policies[module or ''] = policy
+
+
+def get_inner_policy(module: str) -> str:
+    """
+    Resolve the policy applied to items decorated in a module, using the most specific
+    module or package setting.
+
+    Args:
+        module (str): The module name.
+
+    Returns:
+        str: "enforce", "audit" or "off".
+    """
+    name = module
+    while True:
+        if name in _inner_policies:
+            return _inner_policies[name]
+        if not name:
+            return 'enforce'
+        name = name.rpartition('.')[0]
+
+
+def get_inner_violations() -> Dict[str, int]:
+    """
+    Get the number of calls from outside the defining module seen in audit mode.
+
+    Returns:
+        Dict[str, int]: The counts keyed by "<module>.<item>".
+    """
+    return dict(_inner_violations)
+
+
+def _load_inner_policies() -> None:
+    # A bad setting must not make the package unimportable: it is reported and skipped
+    for entry in os.environ.get('JH_DECORATORS_INNER_POLICY', '').split(','):
+        module, _, policy = entry.strip().rpartition('=')
+        if policy:
+            try:
+                set_inner_policy(policy.strip(), module.strip() or None)
+            except ValueError as e:
+                warnings.warn(f"Ignoring JH_DECORATORS_INNER_POLICY entry {entry.strip()!r}: {e}", RuntimeWarning)
+    audit_every = os.environ.get('JH_DECORATORS_INNER_AUDIT_EVERY')
+    if audit_every:
+        try:
+            set_inner_policy(get_inner_policy(''), None, int(audit_every))
+        except ValueError as e:
+            warnings.warn(f"Ignoring JH_DECORATORS_INNER_AUDIT_EVERY={audit_every!r}: {e}", RuntimeWarning)
+
+
+_load_inner_policies()
+
 
 def Inner(item: Callable[..., Any]) -> Callable[..., Any]:
     """
     Decorator to mark a function or a class as internal.
     Internal items will be inaccessible in user modules.
 
+    The policy of the defining module is resolved once, at decoration time: "enforce"
+    raises on calls from outside the module, "audit" checks a sample of calls and counts
+    violations in `get_inner_violations`, and "off" returns the item unwrapped.
+
     Args:
         item (Callable): The callable to be marked as internal.
 
@@ -33,24 +125,58 @@ def Inner(item: Callable[..., Any]) -> Callable[..., Any]:
 
     _inner_items[module_name].append(item_name)
 
+    policy = get_inner_policy(module_name)
+    if policy == 'off':
+        return item
+
+    # Per calling code object, how many frames below it the defining module was last found.
+    # This is only a hint: the frame at that depth is checked again on every call, through
+    # sys._getframe's C-level walk, so no frame is ever kept alive by the cache.
+    module_depths: Dict[CodeType, int] = {}
+
+    def is_allowed(calling_frame: FrameType) -> bool:
+        # calling_frame is two frames up from here, behind the wrapper
+        code = calling_frame.f_code
+        depth = module_depths.get(code)
+        if depth is not None:
+            try:
+                if _frame_getter(2 + depth).f_globals.get('__name__') == module_name:
+                    return True
+            except ValueError:
+                pass
+
+        depth = 0
+        current: Optional[FrameType] = calling_frame
+        while current is not None:
+            if current.f_globals.get('__name__') == module_name:
+                module_depths[code] = depth
+                return True
+            current = current.f_back
+            depth += 1
+        return False
+
+    violation_key = f"{module_name}.{item_name}"
+    audit_every = _inner_audit_every
+    audit_calls = itertools.count()
+
     def wrap_function(func: Callable) -> Callable:
+        if policy == 'audit':
+            @functools.wraps(func)
+            def audited(*args, **kwargs):
+                if next(audit_calls) % audit_every == 0 and not is_allowed(_frame_getter(1)):
+                    _inner_violations[violation_key] = _inner_violations.get(violation_key, 0) + 1
+
+                return func(*args, **kwargs)
+
+            return audited
+
         @functools.wraps(func)
         def wrapped(*args, **kwargs):
             # Check the call stack for the calling module
-            frame_getter = cast(Callable[[int], Any], getattr(sys, '_getframe'))
-            calling_frame = frame_getter(1)
-            calling_module = calling_frame.f_globals['__name__']
-
-            if calling_module != module_name:
-                # Check the entire call stack for the defining module
-                current_frame = calling_frame
-                while current_frame:
-                    if current_frame.f_globals['__name__'] == module_name:
-                        break
-                    current_frame = current_frame.f_back
-                else:
-                    raise RuntimeError(
-                        f"{item_name} is an internal function and cannot be called outside its defining module.")
+            calling_frame = _frame_getter(1)
+            if calling_frame.f_globals.get('__name__') != module_name and not is_allowed(calling_frame):
+                raise RuntimeError(
+                    f"{item_name} is an internal function and cannot be called outside its defining module.")
 
             return func(*args, **kwargs)
 
@@ -92,32 +218,77 @@ class OverrideError(Exception):
         super().__init__(self.message)
 
 
+def _check_override(owner: type, name: str) -> None:
+    if not any(name in vars(base) for base in owner.__mro__[1:]):
+        raise OverrideError(f"{name} does not override any method in superclass")
+
+
+class _OverrideCheck:
+    """
+    Placeholder left in the class body by @Override.
+
+    When the class is created, ``__set_name__`` verifies once that some class in the MRO
+    defines the same name, then replaces itself with the original method or descriptor.
+    A decorator applied on top of @Override, such as ``property`` or ``functools.lru_cache``,
+    hides ``__set_name__``; the placeholder then stays in the class and runs the check on
+    its first use instead.
+    """
+
+    def __init__(self, method: Any) -> None:
+        self.method = method
+        self.checked = False
+        functools.update_wrapper(self, method)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        _check_override(owner, name)
+        self.checked = True
+        setattr(owner, name, self.method)
+
+    def _check_late(self, cls: type) -> None:
+        # The class holding the wrapping decorator is the first one in the MRO defining the name
+        name = self.method.__name__
+        for owner in cls.__mro__:
+            if name in vars(owner):
+                _check_override(owner, name)
+                break
+        self.checked = True
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if not self.checked and owner is not None:
+            # classmethod passes the class itself as the instance
+            self._check_late(instance if isinstance(instance, type) else owner)
+        return self.method.__get__(instance, owner)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if not self.checked and args:
+            self._check_late(args[0] if isinstance(args[0], type) else type(args[0]))
+        return self.method(*args, **kwargs)
+
+
 def Override(method: Callable[..., Any]) -> Callable[..., Any]:
     """
     A decorator to indicate that a method is intended to override a method in the superclass.
-    Raises an OverrideError if the method does not override any method in the superclass.
+    The check runs once, when the class is created, against every class in the MRO; the
+    method left in the class is the original function, so calls carry no overhead.
+
+    @Override should be the outermost decorator; it also accepts a property, staticmethod
+    or classmethod. Under another decorator, the check runs on the first call instead.
 
     Args:
-        method (Callable[..., Any]): The method to be checked for overriding.
+        method (Callable[..., Any]): The method, property, staticmethod or classmethod to be checked for overriding.
 
     Returns:
-        Callable[..., Any]: The original method if it correctly overrides a method in the superclass.
+        Callable[..., Any]: A placeholder that is replaced by the original method at class creation.
 
     Raises:
-        OverrideError: If the method does not override any method in the superclass.
+        OverrideError: At class creation, if the method does not override any method in the superclass.
+            Before Python 3.12 it is raised as the ``__cause__`` of a ``RuntimeError``.
     """
 
-    if not callable(method):
-        raise TypeError(f"{method.__name__} is not a callable")
-
-    @functools.wraps(method)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        cls = args[0].__class__
-        if not any(hasattr(base_class, method.__name__) for base_class in cls.__bases__):
-            raise OverrideError(f"{method.__name__} does not override any method in superclass")
-        return method(*args, **kwargs)
+    if not callable(method) and not isinstance(method, (property, staticmethod, classmethod)):
+        raise TypeError(f"{getattr(method, '__name__', method)!r} is not a callable")
 
-    return wrapper
+    return _OverrideCheck(method)
 
 
 def update_global(name: str, value: Any) -> None:
@@ -1,200 +1,1798 @@
 # jh_decorators/performance.py
 
+import asyncio
+import atexit
+import bisect
+import datetime
+import json
 import logging
 import functools
+import inspect
+import itertools
+import math
+import multiprocessing
+import multiprocessing.util
+import os
+import queue
+import reprlib
+import sys
+import threading
 import time
+import types
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from contextvars import ContextVar, Token
 from rich.progress import Progress, TextColumn, TimeRemainingColumn, BarColumn
-from rich.console import RenderableType
-from rich.progress import Task
-from typing import Optional, List
+from rich.progress_bar import ProgressBar as BarRenderable
+from rich.console import Console, RenderableType
+from rich.progress import Task, TaskID
+from typing import Optional, List, Dict, Tuple, Union, Callable, Any, Awaitable, Generator, TextIO, Iterator, Iterable
 from colorama import Fore, init
 
 # Initialize colorama
 init(autoreset=True)
 
 
+class _InstrumentationConfig:
+    """Global switches shared by every Timing and Log wrapper."""
+
+    __slots__ = ('enabled', 'sample_every', 'sample_interval', 'tracing')
+
+    def __init__(self) -> None:
+        self.enabled: bool = True
+        self.sample_every: int = 1
+        self.sample_interval: float = 0.0
+        self.tracing: bool = False
+
+
+_config = _InstrumentationConfig()
+
+
+class _CallSampler:
+    """Per-wrapper sampling state, consulted only when sampling is configured."""
+
+    __slots__ = ('calls', 'next_time')
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.next_time: float = 0.0
+
+    def should_sample(self) -> bool:
+        config = _config
+        if config.sample_every > 1:
+            self.calls += 1
+            if self.calls < config.sample_every:
+                return False
+            self.calls = 0
+        if config.sample_interval > 0:
+            now = time.monotonic()
+            if now < self.next_time:
+                return False
+            self.next_time = now + config.sample_interval
+        return True
+
+
+def configure(enabled: Optional[bool] = None,
+              sample_every: Optional[int] = None,
+              sample_interval: Optional[float] = None,
+              tracing: Optional[bool] = None,
+              trace_capacity: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Configure all Timing and Log wrappers at runtime. Arguments left as None keep their current value.
+
+    Args:
+        enabled (Optional[bool]): Turn every Timing and Log wrapper on or off. When off, a wrapper
+            only forwards the call.
+        sample_every (Optional[int]): Let Timing measure only one call in every N calls of each function.
+            1 measures every call.
+        sample_interval (Optional[float]): Let Timing measure at most one call per interval, in seconds,
+            for each function. 0 disables the time-based sampling.
+        tracing (Optional[bool]): Let every measured Timing call also record a span, so nested
+            calls can be exported as a flame graph or a Chrome trace.
+        trace_capacity (Optional[int]): The number of most recent spans kept for `export_chrome_trace`.
+            Changing it discards the spans kept so far.
+
+    Returns:
+        Dict[str, Any]: The configuration in effect after the update.
+
+    Raises:
+        ValueError: If sample_every or trace_capacity is smaller than 1, or sample_interval is negative.
+    """
+    if sample_every is not None:
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        _config.sample_every = int(sample_every)
+    if sample_interval is not None:
+        if sample_interval < 0:
+            raise ValueError("sample_interval must not be negative")
+        _config.sample_interval = float(sample_interval)
+    if trace_capacity is not None:
+        if trace_capacity < 1:
+            raise ValueError("trace_capacity must be at least 1")
+        _trace.events = deque(maxlen=int(trace_capacity))
+    if tracing is not None:
+        _config.tracing = bool(tracing)
+    if enabled is not None:
+        _config.enabled = bool(enabled)
+
+    return {
+        'enabled': _config.enabled,
+        'sample_every': _config.sample_every,
+        'sample_interval': _config.sample_interval,
+        'tracing': _config.tracing,
+        'trace_capacity': _trace.events.maxlen,
+    }
+
+
+# Latency histogram layout: every power of two is split into linear sub-buckets
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+_BUCKET_COUNT = (64 - _SUB_BUCKET_BITS) << _SUB_BUCKET_BITS
+_MAX_RECORDABLE = (1 << 63) - 1
+
+# Sparse bucket counts with total, min and max, and the full state a delta is taken against
+HistogramDelta = Tuple[List[Tuple[int, int]], int, int, int]
+HistogramState = Tuple[List[int], int]
+
+# Histograms recorded by Timing in statistics mode, keyed by qualified function name
+_timing_histograms: Dict[str, 'LatencyHistogram'] = {}
+_timing_histograms_lock = threading.Lock()
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    if index < 2 * _SUB_BUCKET_COUNT:
+        return index, index
+    shift = (index >> _SUB_BUCKET_BITS) - 1
+    mantissa = (index & (_SUB_BUCKET_COUNT - 1)) + _SUB_BUCKET_COUNT
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    A fixed-memory histogram of durations in nanoseconds.
+
+    Buckets are logarithmic with 32 linear sub-buckets per power of two, so
+    percentiles are accurate to about 3% and the memory used never grows
+    with the number of recorded samples. Recording takes no lock, which keeps
+    it far cheaper than formatting a string.
+    """
+
+    def __init__(self) -> None:
+        self._counts: List[int] = [0] * _BUCKET_COUNT
+        self.total: int = 0
+        self.min: int = _MAX_RECORDABLE
+        self.max: int = 0
+
+    def record(self, value: int) -> None:
+        """
+        Record a single duration.
+
+        Args:
+            value (int): The duration in nanoseconds.
+        """
+        if value < 2 * _SUB_BUCKET_COUNT:
+            if value < 0:
+                value = 0
+            index = value
+        else:
+            if value > _MAX_RECORDABLE:
+                value = _MAX_RECORDABLE
+            shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+            index = ((shift + 1) << _SUB_BUCKET_BITS) + (value >> shift) - _SUB_BUCKET_COUNT
+        self._counts[index] += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min:
+            self.min = value
+
+    @property
+    def count(self) -> int:
+        """int: The number of recorded samples."""
+        return sum(self._counts)
+
+    def percentile(self, quantile: float) -> int:
+        """
+        Estimate the value below which the given fraction of samples fall.
+
+        Args:
+            quantile (float): The quantile in the range [0, 1], e.g. 0.99 for p99.
+
+        Returns:
+            int: The estimated duration in nanoseconds, or 0 if nothing was recorded.
+        """
+        return self._percentiles(list(self._counts), [quantile])[0]
+
+    def _percentiles(self, counts: List[int], quantiles: List[float]) -> List[int]:
+        count = sum(counts)
+        if count == 0:
+            return [0] * len(quantiles)
+        results: List[int] = []
+        seen = 0
+        index = -1
+        for quantile in quantiles:
+            rank = max(1, math.ceil(quantile * count))
+            while seen < rank:
+                index += 1
+                seen += counts[index]
+            lower, upper = _bucket_bounds(index)
+            results.append(min(max((lower + upper) // 2, self.min), self.max))
+        return results
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Summarize the recorded samples.
+
+        Returns:
+            Dict[str, float]: The sample count and the mean, min, max, p50, p90,
+            p99 and p999 durations in milliseconds.
+        """
+        counts = list(self._counts)
+        count = sum(counts)
+        if count == 0:
+            return {'count': 0, 'mean': 0.0, 'min': 0.0, 'max': 0.0,
+                    'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'p999': 0.0}
+        p50, p90, p99, p999 = self._percentiles(counts, [0.5, 0.9, 0.99, 0.999])
+        return {
+            'count': count,
+            'mean': self.total / count / 1e6,
+            'min': self.min / 1e6,
+            'max': self.max / 1e6,
+            'p50': p50 / 1e6,
+            'p90': p90 / 1e6,
+            'p99': p99 / 1e6,
+            'p999': p999 / 1e6,
+        }
+
+    def reset(self) -> None:
+        """Discard all recorded samples."""
+        self._counts = [0] * _BUCKET_COUNT
+        self.total = 0
+        self.min = _MAX_RECORDABLE
+        self.max = 0
+
+    def delta(self, previous: Optional['HistogramState']) -> Tuple['HistogramDelta', 'HistogramState']:
+        """
+        Compute what was recorded since a previous state, in a compact form for `merge`.
+
+        Args:
+            previous (Optional[HistogramState]): The state returned by the previous call, or None.
+
+        Returns:
+            Tuple[HistogramDelta, HistogramState]: The delta, and the current state for the next call.
+        """
+        counts = list(self._counts)
+        total, minimum, maximum = self.total, self.min, self.max
+        if previous is not None and total >= previous[1]:
+            previous_counts = previous[0]
+            buckets = [(index, count - previous_counts[index])
+                       for index, count in enumerate(counts) if count != previous_counts[index]]
+            if all(change > 0 for _, change in buckets):
+                return (buckets, total - previous[1], minimum, maximum), (counts, total)
+        # First call, or the histogram was reset in between
+        buckets = [(index, count) for index, count in enumerate(counts) if count]
+        return (buckets, total, minimum, maximum), (counts, total)
+
+    def merge(self, delta: 'HistogramDelta') -> None:
+        """
+        Add the samples described by a delta, as returned by `delta`, to this histogram.
+
+        Args:
+            delta (HistogramDelta): The sparse bucket counts, total, min and max to add.
+        """
+        buckets, total, minimum, maximum = delta
+        if not buckets:
+            return
+        counts = self._counts
+        for index, count in buckets:
+            counts[index] += count
+        self.total += total
+        if minimum < self.min:
+            self.min = minimum
+        if maximum > self.max:
+            self.max = maximum
+
+
+def _qualified_name(func: Callable) -> str:
+    # multiprocessing re-imports the main script as __mp_main__ in spawned workers
+    module = '__main__' if func.__module__ == '__mp_main__' else func.__module__
+    return f"{module}.{func.__qualname__}"
+
+
+def _get_histogram(key: str) -> LatencyHistogram:
+    with _timing_histograms_lock:
+        histogram = _timing_histograms.get(key)
+        if histogram is None:
+            histogram = _timing_histograms[key] = LatencyHistogram()
+        return histogram
+
+
+def get_timing_stats(func: Optional[Union[str, Callable]] = None) -> Dict[str, Any]:
+    """
+    Query the latency statistics recorded by Timing in statistics mode.
+
+    Args:
+        func (Optional[Union[str, Callable]]): A decorated function or its qualified name.
+            If omitted, statistics for every recorded function are returned.
+
+    Returns:
+        Dict[str, Any]: The summary of one function, or a mapping of qualified names to summaries.
+
+    Raises:
+        KeyError: If nothing was recorded for the requested function.
+    """
+    if func is None:
+        with _timing_histograms_lock:
+            histograms = list(_timing_histograms.items())
+        return {key: histogram.snapshot() for key, histogram in histograms}
+
+    key = func if isinstance(func, str) else _qualified_name(func)
+    if key not in _timing_histograms:
+        raise KeyError(f"No timing statistics recorded for {key}")
+    return _timing_histograms[key].snapshot()
+
+
+def reset_timing_stats(func: Optional[Union[str, Callable]] = None) -> None:
+    """
+    Reset the latency statistics recorded by Timing in statistics mode.
+
+    Args:
+        func (Optional[Union[str, Callable]]): A decorated function or its qualified name.
+            If omitted, statistics for every function are reset.
+    """
+    if func is None:
+        with _timing_histograms_lock:
+            histograms = list(_timing_histograms.values())
+        for histogram in histograms:
+            histogram.reset()
+        return
+
+    key = func if isinstance(func, str) else _qualified_name(func)
+    if key in _timing_histograms:
+        _timing_histograms[key].reset()
+
+
+class _Span:
+    """A running call of a traced function. Spans form a stack through their parent links."""
+
+    __slots__ = ('path', 'lane', 'child_ns', 'concurrent')
+
+    def __init__(self, path: str, lane: int, concurrent: bool = False) -> None:
+        self.path: str = path
+        self.lane: int = lane
+        self.child_ns: int = 0
+        self.concurrent: bool = concurrent
+
+
+class _TraceBuffer:
+    """Spans aggregated per call path, plus the most recent spans for the Chrome trace."""
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        self.origin_ns: int = time.perf_counter_ns()
+        self.paths: Dict[str, List[int]] = {}
+        self.events: 'deque[Tuple[str, int, int, int]]' = deque(maxlen=capacity)
+
+
+# The innermost running span; contextvars keep one stack per thread and per asyncio task
+_current_span: ContextVar[Optional[_Span]] = ContextVar('jh_decorators_span', default=None)
+_trace = _TraceBuffer()
+
+
+def _enter_span(name: str, lane: Optional[int] = None) -> Tuple[_Span, Token]:
+    parent = _current_span.get()
+    if parent is None:
+        span = _Span(name, threading.get_ident() if lane is None else lane)
+    elif lane is None or lane == parent.lane:
+        span = _Span(f"{parent.path};{name}", parent.lane)
+    else:
+        # Started from the parent in another asyncio task, so it runs concurrently with it
+        span = _Span(f"{parent.path};{name}", lane, True)
+    return span, _current_span.set(span)
+
+
+def _task_lane() -> Optional[int]:
+    # Root spans of different asyncio tasks get their own lane in the Chrome trace
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return None
+    return id(task) if task is not None else None
+
+
+def _exit_span(span: _Span, token: Token, start_ns: int, end_ns: int) -> None:
+    _current_span.reset(token)
+    duration = end_ns - start_ns
+    parent = token.old_value
+    if isinstance(parent, _Span) and not span.concurrent:
+        parent.child_ns += duration
+    _record_span(span.path, span.lane, start_ns, duration, duration - span.child_ns)
+
+
+def _record_span(path: str, lane: int, start_ns: int, duration_ns: int, self_ns: int) -> None:
+    trace = _trace
+    entry = trace.paths.get(path)
+    if entry is None:
+        entry = trace.paths.setdefault(path, [0, 0, 0])
+    entry[0] += 1
+    entry[1] += duration_ns
+    entry[2] += self_ns
+    trace.events.append((path, lane, start_ns, duration_ns))
+
+
+def _record_leaf_span(name: str, start_ns: int, end_ns: int) -> None:
+    # Generators run interleaved with their consumer, so they are never pushed on the
+    # span stack nor charged to the parent; they only appear under the current call path.
+    parent = _current_span.get()
+    if parent is None:
+        _record_span(name, threading.get_ident(), start_ns, end_ns - start_ns, end_ns - start_ns)
+    else:
+        _record_span(f"{parent.path};{name}", parent.lane, start_ns, end_ns - start_ns, end_ns - start_ns)
+
+
+def get_trace_summary() -> Dict[str, Dict[str, float]]:
+    """
+    Summarize the spans recorded while tracing was enabled.
+
+    Returns:
+        Dict[str, Dict[str, float]]: For each call path, written as semicolon-separated qualified names
+        from the outermost call, the number of calls and the inclusive and self time in milliseconds.
+    """
+    return {path: {'count': count, 'inclusive': inclusive / 1e6, 'self': self_time / 1e6}
+            for path, (count, inclusive, self_time) in list(_trace.paths.items())}
+
+
+def reset_trace() -> None:
+    """Discard every span recorded so far."""
+    global _trace
+    _trace = _TraceBuffer(_trace.events.maxlen or 100_000)
+
+
+def export_collapsed_stacks(path: str) -> None:
+    """
+    Write the recorded self time per call path in the collapsed-stack format read by
+    flamegraph.pl and speedscope. Each line holds a call path and its self time in microseconds.
+
+    Args:
+        path (str): The file to write.
+    """
+    with open(path, 'w') as f:
+        for stack, (_, _, self_time) in sorted(list(_trace.paths.items())):
+            f.write(f"{stack} {max(0, self_time) // 1000}\n")
+
+
+def export_chrome_trace(path: str) -> None:
+    """
+    Write the most recent spans as Chrome trace-event JSON, viewable in chrome://tracing or Perfetto.
+
+    Args:
+        path (str): The file to write.
+    """
+    trace = _trace
+    pid = os.getpid()
+    events = [{
+        'name': stack.rsplit(';', 1)[-1],
+        'cat': 'function',
+        'ph': 'X',
+        'ts': (start - trace.origin_ns) / 1000,
+        'dur': duration / 1000,
+        'pid': pid,
+        'tid': lane,
+        'args': {'stack': stack},
+    } for stack, lane, start, duration in list(trace.events)]
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def _should_measure(sampler: _CallSampler) -> bool:
+    config = _config
+    if not config.enabled:
+        return False
+    return not (config.sample_every > 1 or config.sample_interval > 0) or sampler.should_sample()
+
+
+@types.coroutine
+def _on_cpu(awaitable: Awaitable, cpu_ns: List[int]) -> Generator[Any, Any, Any]:
+    """Drive an awaitable step by step, adding the CPU time spent inside each step to cpu_ns[0]."""
+    iterator = awaitable.__await__()
+    value: Any = None
+    error: Optional[BaseException] = None
+    while True:
+        step_start = time.thread_time_ns()
+        try:
+            if error is None:
+                yielded = iterator.send(value)
+            else:
+                yielded = iterator.throw(error)
+        except StopIteration as stop:
+            cpu_ns[0] += time.thread_time_ns() - step_start
+            return stop.value
+        except BaseException:
+            cpu_ns[0] += time.thread_time_ns() - step_start
+            raise
+        cpu_ns[0] += time.thread_time_ns() - step_start
+        try:
+            value, error = (yield yielded), None
+        except GeneratorExit:
+            iterator.close()
+            raise
+        except BaseException as e:
+            value, error = None, e
+
+
+class _TimingReporter:
+    """Formats or records the measurements of one decorated function."""
+
+    __slots__ = ('name', 'key', 'wall', 'first_item', 'cpu')
+
+    def __init__(self, func: Callable, stats: bool, cpu_time: bool, streaming: bool) -> None:
+        key = _qualified_name(func)
+        self.name: str = func.__name__
+        self.key: str = key
+        self.wall: Optional[LatencyHistogram] = _get_histogram(key) if stats else None
+        self.first_item: Optional[LatencyHistogram] = \
+            _get_histogram(f"{key}:first_item") if stats and streaming else None
+        self.cpu: Optional[LatencyHistogram] = _get_histogram(f"{key}:cpu") if stats and cpu_time else None
+
+    def report(self, output_obj: Optional[List], duration_ns: int,
+               first_item_ns: Optional[int] = None, cpu_ns: Optional[int] = None) -> None:
+        if self.wall is not None:
+            self.wall.record(duration_ns)
+            if first_item_ns is not None and self.first_item is not None:
+                self.first_item.record(first_item_ns)
+            if cpu_ns is not None and self.cpu is not None:
+                self.cpu.record(cpu_ns)
+            return
+
+        output_str = f"Function {self.name} took {duration_ns / 1e6:.4f} ms"
+        if first_item_ns is not None:
+            output_str += f", first item after {first_item_ns / 1e6:.4f} ms"
+        if cpu_ns is not None:
+            output_str += f", {cpu_ns / 1e6:.4f} ms on CPU"
+        _emit_log(output_obj, Fore.CYAN, output_str)
+
+
+def _timing_wrapper(func: Callable, output_obj: Optional[List], stats: bool, cpu_time: bool = False) -> Callable:
+    if inspect.iscoroutinefunction(func):
+        wrapper = _timing_coroutine_wrapper(func, stats, cpu_time)
+    elif inspect.isgeneratorfunction(func):
+        wrapper = _timing_generator_wrapper(func, stats, cpu_time)
+    elif inspect.isasyncgenfunction(func):
+        wrapper = _timing_async_generator_wrapper(func, stats, cpu_time)
+    else:
+        wrapper = _timing_function_wrapper(func, stats, cpu_time)
+
+    wrapper.output_obj = output_obj
+    return wrapper
+
+
+def _timing_function_wrapper(func: Callable, stats: bool, cpu_time: bool) -> Callable:
+    reporter = _TimingReporter(func, stats, cpu_time, False)
+    histogram = reporter.wall
+    sampler = _CallSampler()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        config = _config
+        if not config.enabled:
+            return func(*args, **kwargs)
+        if (config.sample_every > 1 or config.sample_interval > 0) and not sampler.should_sample():
+            return func(*args, **kwargs)
+
+        if config.tracing:
+            span, token = _enter_span(reporter.key)
+            cpu_start = time.thread_time_ns() if cpu_time else 0
+            start_time = time.perf_counter_ns()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                end_time = time.perf_counter_ns()
+                _exit_span(span, token, start_time, end_time)
+            reporter.report(wrapper.output_obj, end_time - start_time,
+                            cpu_ns=time.thread_time_ns() - cpu_start if cpu_time else None)
+            return result
+
+        if cpu_time:
+            cpu_start = time.thread_time_ns()
+            start_time = time.perf_counter_ns()
+            result = func(*args, **kwargs)
+            duration = time.perf_counter_ns() - start_time
+            reporter.report(wrapper.output_obj, duration, cpu_ns=time.thread_time_ns() - cpu_start)
+            return result
+
+        start_time = time.perf_counter_ns()
+        result = func(*args, **kwargs)
+        duration = time.perf_counter_ns() - start_time
+
+        if histogram is not None:
+            histogram.record(duration)
+        else:
+            reporter.report(wrapper.output_obj, duration)
+        return result
+
+    return wrapper
+
+
+def _timing_coroutine_wrapper(func: Callable, stats: bool, cpu_time: bool) -> Callable:
+    reporter = _TimingReporter(func, stats, cpu_time, False)
+    sampler = _CallSampler()
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not _should_measure(sampler):
+            return await func(*args, **kwargs)
+
+        span: Optional[_Span] = None
+        if _config.tracing:
+            span, token = _enter_span(reporter.key, _task_lane())
+        cpu_ns = [0]
+        start_time = time.perf_counter_ns()
+        try:
+            result = await (_on_cpu(func(*args, **kwargs), cpu_ns) if cpu_time else func(*args, **kwargs))
+        finally:
+            end_time = time.perf_counter_ns()
+            if span is not None:
+                _exit_span(span, token, start_time, end_time)
+        reporter.report(wrapper.output_obj, end_time - start_time, cpu_ns=cpu_ns[0] if cpu_time else None)
+        return result
+
+    return wrapper
+
+
+def _timing_generator_wrapper(func: Callable, stats: bool, cpu_time: bool) -> Callable:
+    reporter = _TimingReporter(func, stats, cpu_time, True)
+    sampler = _CallSampler()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        generator = func(*args, **kwargs)
+        if not _should_measure(sampler):
+            return (yield from generator)
+
+        start_time = time.perf_counter_ns()
+        first_item: Optional[int] = None
+        cpu_ns = 0
+        value: Any = None
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                step_start = time.thread_time_ns() if cpu_time else 0
+                try:
+                    item = generator.send(value) if error is None else generator.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    if cpu_time:
+                        cpu_ns += time.thread_time_ns() - step_start
+                if first_item is None:
+                    first_item = time.perf_counter_ns() - start_time
+                try:
+                    value, error = (yield item), None
+                except GeneratorExit:
+                    generator.close()
+                    raise
+                except BaseException as e:
+                    value, error = None, e
+        finally:
+            end_time = time.perf_counter_ns()
+            if _config.tracing:
+                _record_leaf_span(reporter.key, start_time, end_time)
+            reporter.report(wrapper.output_obj, end_time - start_time,
+                            first_item, cpu_ns if cpu_time else None)
+
+    return wrapper
+
+
+def _timing_async_generator_wrapper(func: Callable, stats: bool, cpu_time: bool) -> Callable:
+    reporter = _TimingReporter(func, stats, cpu_time, True)
+    sampler = _CallSampler()
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        generator = func(*args, **kwargs)
+        measured = _should_measure(sampler)
+        start_time = time.perf_counter_ns()
+        first_item: Optional[int] = None
+        cpu_ns = [0]
+        value: Any = None
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                step = generator.asend(value) if error is None else generator.athrow(error)
+                try:
+                    item = await (_on_cpu(step, cpu_ns) if measured and cpu_time else step)
+                except StopAsyncIteration:
+                    return
+                if first_item is None:
+                    first_item = time.perf_counter_ns() - start_time
+                try:
+                    value, error = (yield item), None
+                except GeneratorExit:
+                    await generator.aclose()
+                    raise
+                except BaseException as e:
+                    value, error = None, e
+        finally:
+            if measured:
+                end_time = time.perf_counter_ns()
+                if _config.tracing:
+                    _record_leaf_span(reporter.key, start_time, end_time)
+                reporter.report(wrapper.output_obj, end_time - start_time,
+                                first_item, cpu_ns[0] if cpu_time else None)
+
+    return wrapper
+
+
 # Timing Decorator
-def Timing(output_obj: Optional[List] = None):
+def Timing(output_obj: Optional[List] = None, stats: bool = False, cpu_time: bool = False):
     """
     A decorator to measure the execution time of a function and optionally
     output the result to a list object.
 
+    In statistics mode no string is produced per call. Instead, every duration is
+    recorded into a fixed-memory histogram that can be queried with `get_timing_stats`
+    and cleared with `reset_timing_stats`. Sampling and the global on/off switch are
+    controlled with `configure`.
+
+    Coroutine functions are timed until the coroutine completes. Generators and async
+    generators are timed from the first item requested until they are exhausted or
+    closed, and the time to the first item is reported as well.
+
+    When tracing is enabled through `configure(tracing=True)`, each measured call also
+    records a span under its caller, so nested decorated calls can be summarized with
+    `get_trace_summary` and exported with `export_collapsed_stacks` or `export_chrome_trace`.
+
     Args:
-        output_obj (Optional[list]): An optional list object to store the result.
+        output_obj (Optional[Union[list, RingBuffer, BackgroundSink]]): An optional list object, ring buffer
+            or sink to store the result.
+        stats (bool): If True, aggregate durations into a latency histogram instead of reporting each call.
+        cpu_time (bool): If True, also measure the CPU time spent inside the function, which
+            excludes the time a coroutine spends awaiting or a generator spends suspended.
 
     Returns:
         Callable: The decorated function with timing functionality.
     """
     if callable(output_obj):
-        func = output_obj
-        output_obj = None
+        return _timing_wrapper(output_obj, None, False)
+
+    def decorator(__func):
+        return _timing_wrapper(__func, output_obj, stats, cpu_time)
+
+    return decorator
+
+
+# Counters maintained by the instrumentation itself, such as records dropped by a sink
+_counters: Dict[str, int] = {}
+
+
+def get_counters() -> Dict[str, int]:
+    """
+    Get the counters maintained by the instrumentation, such as the records dropped by each BackgroundSink.
+
+    Returns:
+        Dict[str, int]: A copy of the counters keyed by name.
+    """
+    return dict(_counters)
+
+
+class BackgroundSink:
+    """
+    A queue-backed output for Timing and Log. Callers only enqueue a record and a background
+    thread writes the records in batches to stdout, a file or a logging.Handler.
+
+    Args:
+        target (Optional[Union[str, TextIO, logging.Handler]]): Where records are written: None for stdout,
+            a file path, a writable text stream or a logging.Handler.
+        max_queue (int): The maximum number of records waiting to be written.
+        policy (str): What to do when the queue is full: "drop" discards the record and counts it,
+            "block" waits until there is room.
+        batch_size (int): The maximum number of records written at once.
+        flush_interval (float): How long, in seconds, the writer waits for more records before writing a batch.
+        name (str): The prefix of this sink's counters in `get_counters`.
+
+    Raises:
+        ValueError: If policy is neither "drop" nor "block".
+    """
+
+    def __init__(self, target: Optional[Union[str, TextIO, logging.Handler]] = None, max_queue: int = 10000,
+                 policy: str = 'drop', batch_size: int = 256, flush_interval: float = 0.1,
+                 name: str = 'sink') -> None:
+        if policy not in ('drop', 'block'):
+            raise ValueError(f"Unknown queue policy: {policy}")
+
+        self.policy = policy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.name = name
+        self._owns_stream = isinstance(target, str)
+        self._target = open(target, 'a') if isinstance(target, str) else target
+        self._queue: 'queue.Queue[Optional[Tuple[int, str, Any]]]' = queue.Queue(max_queue)
+        self._dropped_key = f"{name}.dropped"
+        self._written_key = f"{name}.written"
+        _counters.setdefault(self._dropped_key, 0)
+        _counters.setdefault(self._written_key, 0)
+        self._closed = False
+
+        self._writer = threading.Thread(target=self._run, name=f"jh_decorators-{name}", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    @property
+    def dropped(self) -> int:
+        """int: The number of records discarded because the queue was full."""
+        return _counters[self._dropped_key]
+
+    @property
+    def written(self) -> int:
+        """int: The number of records written so far."""
+        return _counters[self._written_key]
+
+    def submit(self, message: Any, level: int = logging.INFO, color: str = '') -> None:
+        """
+        Enqueue a record without writing it.
+
+        Args:
+            message (Any): The record; it is converted to a string by the writer thread.
+            level (int): The logging level, used when the target is a logging.Handler.
+            color (str): A colorama prefix, used when writing to stdout.
+        """
+        if self._closed:
+            return
+        if self.policy == 'drop':
+            try:
+                self._queue.put_nowait((level, color, message))
+            except queue.Full:
+                _counters[self._dropped_key] += 1
+        else:
+            self._queue.put((level, color, message))
+
+    def append(self, message: Any) -> None:
+        """
+        Enqueue a record, so the sink can be used wherever a list is accepted.
+
+        Args:
+            message (Any): The record.
+        """
+        self.submit(message)
+
+    def flush(self) -> None:
+        """Block until every record enqueued so far has been written."""
+        if self._writer.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining records and stop the writer thread. Called automatically at exit."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        atexit.unregister(self.close)
+        if self._owns_stream:
+            self._target.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            records = [record for record in batch if record is not None]
+            try:
+                self._write(records)
+            except Exception as e:
+                print(Fore.RED + f"{self.name} failed to write {len(records)} records: {e}")
+            _counters[self._written_key] += len(records)
+            for _ in batch:
+                self._queue.task_done()
+            if len(records) < len(batch):
+                return
+
+    def _write(self, records: List[Tuple[int, str, Any]]) -> None:
+        if not records:
+            return
+        target = self._target
+        if isinstance(target, logging.Handler):
+            for level, _, message in records:
+                target.handle(logging.LogRecord(self.name, level, '', 0, message, None, None))
+        elif target is None:
+            sys.stdout.write(''.join(f"{color}{message}{Fore.RESET}\n" for _, color, message in records))
+            sys.stdout.flush()
+        else:
+            target.write(''.join(f"{message}\n" for _, _, message in records))
+            target.flush()
+
+
+class _BoundedRepr(reprlib.Repr):
+    """reprlib limits applied to logged arguments and return values."""
+
+    def repr_bytes(self, x: bytes, level: int) -> str:
+        if len(x) > self.maxstring:
+            return repr(x[:self.maxstring]) + '...'
+        return repr(x)
+
+    repr_bytearray = repr_bytes
+
+
+_log_repr = _BoundedRepr()
+
+
+def configure_log_repr(length: Optional[int] = None, depth: Optional[int] = None,
+                       items: Optional[int] = None) -> None:
+    """
+    Set the limits used when Log renders arguments and return values. Arguments left as None keep their value.
+
+    Args:
+        length (Optional[int]): The maximum length of a rendered string, bytes or other object.
+        depth (Optional[int]): The maximum nesting depth of rendered containers.
+        items (Optional[int]): The maximum number of items rendered per container.
+    """
+    if length is not None:
+        _log_repr.maxstring = _log_repr.maxother = _log_repr.maxlong = length
+    if depth is not None:
+        _log_repr.maxlevel = depth
+    if items is not None:
+        _log_repr.maxlist = _log_repr.maxtuple = _log_repr.maxdict = items
+        _log_repr.maxset = _log_repr.maxfrozenset = _log_repr.maxdeque = _log_repr.maxarray = items
+
+
+configure_log_repr(length=200, depth=4, items=20)
+
+
+def _render_value(value: Any) -> str:
+    if isinstance(value, str):
+        return value if len(value) <= _log_repr.maxstring else value[:_log_repr.maxstring] + '...'
+    return _log_repr.repr(value)
+
+
+class _CallRecord:
+    """A structured Log record, rendered only when it is written."""
+
+    __slots__ = ('event', 'name', 'args', 'kwargs', 'value', 'items')
+
+    def __init__(self, event: str, name: str, args: Any = None, kwargs: Any = None,
+                 value: Any = None, items: Optional[int] = None) -> None:
+        self.event = event
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.value = value
+        self.items = items
+
+    def __str__(self) -> str:
+        name = self.name
+        if self.event == 'call':
+            return f"Calling {name} with args: {_log_repr.repr(self.args)}, kwargs: {_log_repr.repr(self.kwargs)}"
+        suffix = "" if self.items is None else f" after yielding {self.items} items"
+        if self.event == 'return':
+            return f"{name} returned {_render_value(self.value)}{suffix}"
+        if self.event == 'finish':
+            return f"{name} finished{suffix}"
+        return f"Error in {name}{suffix}: {_render_value(str(self.value))}"
+
+    __repr__ = __str__
+
+
+class RingBuffer:
+    """
+    A bounded output for Timing and Log that keeps only the most recent records in
+    preallocated storage. It can be used wherever a list is accepted.
+
+    Appending takes no lock: each record claims a slot from an atomic counter, so the
+    buffer can be shared by many threads. Readers never block writers; `snapshot` copies
+    the slots in a single step and `drain` swaps in fresh storage, and both order the
+    records from the write cursor in linear time.
+
+    A record appended by another thread while `drain` runs may be written to the storage
+    being drained after it was read, and is then lost. Drain while producers are idle if
+    every record matters.
+
+    Args:
+        capacity (int): The number of records kept.
+
+    Raises:
+        ValueError: If capacity is smaller than 1.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._state: Tuple[List[Optional[Tuple[int, Any]]], Iterator[int]] = \
+            ([None] * capacity, itertools.count())
+
+    def append(self, record: Any) -> None:
+        """
+        Store a record, overwriting the oldest one once the buffer is full.
+
+        Args:
+            record (Any): The record.
+        """
+        slots, counter = self._state
+        index = next(counter)
+        slots[index % self.capacity] = (index, record)
+
+    def snapshot(self) -> List[Any]:
+        """
+        Get the records currently held, oldest first, without removing them.
+
+        Returns:
+            List[Any]: The records.
+        """
+        return self._ordered(self._state[0][:])
+
+    def drain(self) -> List[Any]:
+        """
+        Remove and return the records currently held, oldest first.
+
+        Returns:
+            List[Any]: The records.
+        """
+        slots, _ = self._state
+        self._state = ([None] * self.capacity, itertools.count())
+        return self._ordered(slots)
+
+    @staticmethod
+    def _ordered(slots: List[Optional[Tuple[int, Any]]]) -> List[Any]:
+        # The slot holding the highest index is the one just behind the write cursor; the
+        # oldest records start right after it
+        indices = [-1 if slot is None else slot[0] for slot in slots]
+        cursor = indices.index(max(indices)) + 1
+        return [slot[1] for slot in slots[cursor:] + slots[:cursor] if slot is not None]
+
+    def __len__(self) -> int:
+        return sum(1 for slot in self._state[0] if slot is not None)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.snapshot())
+
+
+def _emit_log(output_obj: Optional[List], color: str, log_msg: Any) -> None:
+    if output_obj is None:
+        print(f"{color}{log_msg}")
+    elif isinstance(output_obj, list):
+        output_obj.append(str(log_msg))
+    elif isinstance(output_obj, RingBuffer):
+        output_obj.append(log_msg)
+    elif isinstance(output_obj, BackgroundSink):
+        output_obj.submit(log_msg, logging.ERROR if color == Fore.RED else logging.INFO, color)
+
+
+def _log_wrapper(func: Callable, output_obj: Optional[List], level: Optional[int] = None) -> Callable:
+    if inspect.iscoroutinefunction(func):
+        wrapper = _log_coroutine_wrapper(func, level)
+    elif inspect.isgeneratorfunction(func):
+        wrapper = _log_generator_wrapper(func, level)
+    elif inspect.isasyncgenfunction(func):
+        wrapper = _log_async_generator_wrapper(func, level)
+    else:
+        wrapper = _log_function_wrapper(func, level)
+
+    wrapper.output_obj = output_obj
+    return wrapper
+
+
+def _log_function_wrapper(func: Callable, level: Optional[int]) -> Callable:
+    name = func.__name__
+    logger = logging.getLogger(func.__module__)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _config.enabled:
+            # Errors are swallowed as when enabled, only not reported
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                return None
+
+        verbose = level is None or logger.isEnabledFor(level)
+        try:
+            if verbose:
+                _emit_log(wrapper.output_obj, Fore.YELLOW, _CallRecord('call', name, args, kwargs))
 
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
             result = func(*args, **kwargs)
-            end_time = time.time()
-            duration = (end_time - start_time) * 1000  # Convert to milliseconds
-            output_str = f"Function {func.__name__} took {duration:.4f} ms"
-
-            if output_obj is None:
-                print(Fore.CYAN + output_str)
-            elif isinstance(output_obj, list):
-                output_obj.append(output_str)
+
+            if verbose:
+                _emit_log(wrapper.output_obj, Fore.YELLOW, _CallRecord('return', name, value=result))
+
             return result
+        except Exception as e:
+            _emit_log(wrapper.output_obj, Fore.RED, _CallRecord('error', name, value=e))
 
-        return wrapper
+            return None
 
-    def decorator(__func):
-        @functools.wraps(__func)
-        def _wrapper(*args, **kwargs):
-            start_time = time.time()
-            result = __func(*args, **kwargs)
-            end_time = time.time()
-            duration = (end_time - start_time) * 1000  # Convert to milliseconds
-            output_str = f"Function {__func.__name__} took {duration:.4f} ms"
-
-            if _wrapper.output_obj is None:
-                print(Fore.CYAN + output_str)
-            elif isinstance(_wrapper.output_obj, list):
-                _wrapper.output_obj.append(output_str)
+    return wrapper
+
+
+def _log_coroutine_wrapper(func: Callable, level: Optional[int]) -> Callable:
+    name = func.__name__
+    logger = logging.getLogger(func.__module__)
 
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not _config.enabled:
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                return None
+
+        verbose = level is None or logger.isEnabledFor(level)
+        try:
+            if verbose:
+                _emit_log(wrapper.output_obj, Fore.YELLOW, _CallRecord('call', name, args, kwargs))
+            result = await func(*args, **kwargs)
+            if verbose:
+                _emit_log(wrapper.output_obj, Fore.YELLOW, _CallRecord('return', name, value=result))
             return result
+        except Exception as e:
+            _emit_log(wrapper.output_obj, Fore.RED, _CallRecord('error', name, value=e))
+            return None
 
-        _wrapper.output_obj = output_obj
-        return _wrapper
+    return wrapper
 
-    return decorator
+
+def _log_generator_wrapper(func: Callable, level: Optional[int]) -> Callable:
+    name = func.__name__
+    logger = logging.getLogger(func.__module__)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _config.enabled:
+            try:
+                return (yield from func(*args, **kwargs))
+            except Exception:
+                return None
+
+        verbose = level is None or logger.isEnabledFor(level)
+        items = 0
+        try:
+            if verbose:
+                _emit_log(wrapper.output_obj, Fore.YELLOW, _CallRecord('call', name, args, kwargs))
+            generator = func(*args, **kwargs)
+            value: Any = None
+            error: Optional[BaseException] = None
+            while True:
+                try:
+                    item = generator.send(value) if error is None else generator.throw(error)
+                except StopIteration as stop:
+                    if verbose:
+                        _emit_log(wrapper.output_obj, Fore.YELLOW,
+                                  _CallRecord('return', name, value=stop.value, items=items))
+                    return stop.value
+                items += 1
+                try:
+                    value, error = (yield item), None
+                except GeneratorExit:
+                    generator.close()
+                    raise
+                except Exception as e:
+                    value, error = None, e
+        except Exception as e:
+            _emit_log(wrapper.output_obj, Fore.RED, _CallRecord('error', name, value=e, items=items))
+            return None
+
+    return wrapper
+
+
+def _log_async_generator_wrapper(func: Callable, level: Optional[int]) -> Callable:
+    name = func.__name__
+    logger = logging.getLogger(func.__module__)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        generator = func(*args, **kwargs)
+        enabled = _config.enabled
+        verbose = enabled and (level is None or logger.isEnabledFor(level))
+        items = 0
+        try:
+            if verbose:
+                _emit_log(wrapper.output_obj, Fore.YELLOW, _CallRecord('call', name, args, kwargs))
+            value: Any = None
+            error: Optional[BaseException] = None
+            while True:
+                try:
+                    item = await (generator.asend(value) if error is None else generator.athrow(error))
+                except StopAsyncIteration:
+                    if verbose:
+                        _emit_log(wrapper.output_obj, Fore.YELLOW, _CallRecord('finish', name, items=items))
+                    return
+                items += 1
+                try:
+                    value, error = (yield item), None
+                except GeneratorExit:
+                    await generator.aclose()
+                    raise
+                except Exception as e:
+                    value, error = None, e
+        except Exception as e:
+            if enabled:
+                _emit_log(wrapper.output_obj, Fore.RED, _CallRecord('error', name, value=e, items=items))
+
+    return wrapper
 
 
 # Logging Decorator
-def Log(output_obj: Optional[List] = None):
+def Log(output_obj: Optional[List] = None, level: Optional[int] = None):
     """
     A decorator to log function calls, arguments, and return values.
-    Optionally outputs the log to a list object.
+    Optionally outputs the log to a list object, or to a BackgroundSink that
+    writes the records on a background thread.
+
+    Coroutine functions are logged with the awaited result. Generators and async
+    generators are logged when they finish, together with the number of items yielded.
+
+    Arguments and return values are rendered within the limits set by `configure_log_repr`,
+    and only when a record is written, so a BackgroundSink renders them on its own thread.
+    Calls are always recorded by default. With a level, they are not recorded at all while
+    the logger of the function's module is not enabled for it; errors are still reported.
+    Log never configures logging itself.
 
     Args:
-        output_obj (Optional[list]): An optional list object to store the log.
+        output_obj (Optional[Union[list, RingBuffer, BackgroundSink]]): An optional list object, ring buffer
+            or sink to store the log.
+        level (Optional[int]): If given, record calls only while the module logger is enabled for this level.
 
     Returns:
         Callable: The decorated function with logging functionality.
     """
     if callable(output_obj):
-        func = output_obj
-        output_obj = None
+        return _log_wrapper(output_obj, None)
 
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            log_msg_prefix = ""
-            try:
-                log_msg = f"{log_msg_prefix}Calling {func.__name__} with args: {args}, kwargs: {kwargs}"
-                if output_obj is None:
-                    print(Fore.YELLOW + log_msg)
-                elif isinstance(output_obj, list):
-                    output_obj.append(log_msg)
-                result = func(*args, **kwargs)
-                log_msg = f"{log_msg_prefix}{func.__name__} returned {result}"
-                if output_obj is None:
-                    print(Fore.YELLOW + log_msg)
-                elif isinstance(output_obj, list):
-                    output_obj.append(log_msg)
-                return result
-            except Exception as e:
-                log_msg = f"{log_msg_prefix}Error in {func.__name__}: {e}"
-                if output_obj is None:
-                    print(Fore.RED + log_msg)
-                elif isinstance(output_obj, list):
-                    output_obj.append(log_msg)
-                return None
+    def decorator(__func):
+        return _log_wrapper(__func, output_obj, level)
 
-        return wrapper
+    return decorator
 
-    logging.basicConfig(level=logging.INFO)
 
-    def decorator(__func):
-        @functools.wraps(__func)
-        def _wrapper(*args, **kwargs):
-            log_msg_prefix = ""
+def _collect_deltas(previous: Dict[str, Any]) -> Tuple[Dict[str, HistogramDelta], Dict[str, int]]:
+    """Compute histogram and counter deltas since the states stored in previous, updating it."""
+    histogram_states: Dict[str, HistogramState] = previous.setdefault('histograms', {})
+    counter_states: Dict[str, int] = previous.setdefault('counters', {})
 
-            try:
-                log_msg = f"{log_msg_prefix}Calling {__func.__name__} with args: {args}, kwargs: {kwargs}"
-                if _wrapper.output_obj is None:
-                    print(Fore.YELLOW + log_msg)
-                elif isinstance(_wrapper.output_obj, list):
-                    _wrapper.output_obj.append(log_msg)
+    with _timing_histograms_lock:
+        histograms = list(_timing_histograms.items())
+    histogram_deltas: Dict[str, HistogramDelta] = {}
+    for key, histogram in histograms:
+        delta, histogram_states[key] = histogram.delta(histogram_states.get(key))
+        if delta[0]:
+            histogram_deltas[key] = delta
 
-                result = __func(*args, **kwargs)
+    counter_deltas: Dict[str, int] = {}
+    for key, value in list(_counters.items()):
+        change = value - counter_states.get(key, 0)
+        if change:
+            counter_deltas[key] = change
+        counter_states[key] = value
+    return histogram_deltas, counter_deltas
 
-                log_msg = f"{log_msg_prefix}{__func.__name__} returned {result}"
-                if _wrapper.output_obj is None:
-                    print(Fore.YELLOW + log_msg)
-                elif isinstance(_wrapper.output_obj, list):
-                    _wrapper.output_obj.append(log_msg)
 
-                return result
-            except Exception as e:
-                log_msg = f"{log_msg_prefix}Error in {__func.__name__}: {e}"
-                if _wrapper.output_obj is None:
-                    print(Fore.RED + log_msg)
-                elif isinstance(_wrapper.output_obj, list):
-                    _wrapper.output_obj.append(log_msg)
+class _WorkerCollector:
+    """Worker side of a MetricsAggregator: ships deltas on a timer and once more at exit."""
 
-                return None
+    def __init__(self, channel: Any, interval: float) -> None:
+        self.channel = channel
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.previous: Dict[str, Any] = {}
+        # Whatever was inherited from the parent through fork is not this worker's work
+        _collect_deltas(self.previous)
+        self.stopped = threading.Event()
 
-        _wrapper.output_obj = output_obj
-        return _wrapper
+    def ship(self) -> None:
+        with self.lock:
+            histogram_deltas, counter_deltas = _collect_deltas(self.previous)
+            if histogram_deltas or counter_deltas:
+                self.channel.put((os.getpid(), histogram_deltas, counter_deltas))
 
-    return decorator
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.ship()
 
+    def stop(self) -> None:
+        self.stopped.set()
+        self.ship()
 
-# Progress Bar Decorator with dynamic colors
-def ProgressBar(func):
+
+_worker_collector: Optional[_WorkerCollector] = None
+
+
+def start_worker_collector(channel: Any, interval: float = 1.0) -> None:
     """
-    A decorator to add a progress bar to a function, with dynamic colors based on the progress percentage.
+    Start shipping this process's Timing statistics and counters to a MetricsAggregator.
+    Pass it as the initializer of a process pool, with the aggregator's `initargs`.
 
     Args:
-        func (Callable): The function to be decorated.
+        channel (Any): The aggregator's multiprocessing queue.
+        interval (float): How often, in seconds, deltas are shipped. A final delta is shipped
+            when the worker exits normally.
+    """
+    global _worker_collector
+    if _worker_collector is not None:
+        _worker_collector.stop()
 
-    Returns:
-        Callable: The decorated function with a progress bar.
+    collector = _worker_collector = _WorkerCollector(channel, interval)
+    threading.Thread(target=collector.run, name="jh_decorators-collector", daemon=True).start()
+    # multiprocessing runs its finalizers when a worker exits, even where atexit handlers do not run
+    multiprocessing.util.Finalize(collector, collector.stop, exitpriority=10)
+
+
+class MetricsAggregator:
+    """
+    Merges the Timing statistics and counters of worker processes into one view.
+
+    Workers never send individual records: each ships compact histogram and counter deltas
+    at a fixed interval over a multiprocessing queue, and a thread in the parent merges them.
+
+    Args:
+        interval (float): How often, in seconds, workers ship their deltas.
+        context (Optional[Any]): The multiprocessing context the workers are started with.
     """
 
-    class ColorChangingBarColumn(BarColumn):
+    def __init__(self, interval: float = 1.0, context: Optional[Any] = None) -> None:
+        self.interval = interval
+        self.queue = (context or multiprocessing).Queue()
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._workers: set = set()
+        self._receiver = threading.Thread(target=self._run, name="jh_decorators-aggregator", daemon=True)
+        self._receiver.start()
+
+    @property
+    def initializer(self) -> Callable[[Any, float], None]:
+        """Callable: The process pool initializer that starts shipping from each worker."""
+        return start_worker_collector
+
+    @property
+    def initargs(self) -> Tuple[Any, float]:
+        """Tuple: The arguments for `initializer`."""
+        return self.queue, self.interval
+
+    def _run(self) -> None:
+        while True:
+            message = self.queue.get()
+            if message is None:
+                return
+            pid, histogram_deltas, counter_deltas = message
+            with self._lock:
+                self._workers.add(pid)
+                for key, delta in histogram_deltas.items():
+                    histogram = self._histograms.get(key)
+                    if histogram is None:
+                        histogram = self._histograms[key] = LatencyHistogram()
+                    histogram.merge(delta)
+                for key, change in counter_deltas.items():
+                    self._counters[key] = self._counters.get(key, 0) + change
+
+    def _merged(self, include_local: bool) -> Dict[str, LatencyHistogram]:
+        merged: Dict[str, LatencyHistogram] = {}
+        sources = [self._histograms]
+        if include_local:
+            with _timing_histograms_lock:
+                sources.append(dict(_timing_histograms))
+        for histograms in sources:
+            for key, histogram in list(histograms.items()):
+                target = merged.setdefault(key, LatencyHistogram())
+                target.merge(histogram.delta(None)[0])
+        return merged
+
+    def stats(self, include_local: bool = True) -> Dict[str, Dict[str, float]]:
+        """
+        Get the merged latency statistics of every worker.
+
+        Args:
+            include_local (bool): If True, also merge the statistics recorded in this process.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Summaries keyed by qualified function name, as in `get_timing_stats`.
         """
-        A custom BarColumn class that changes color dynamically based on the progress percentage.
+        with self._lock:
+            merged = self._merged(include_local)
+        return {key: histogram.snapshot() for key, histogram in merged.items()}
+
+    def counters(self, include_local: bool = True) -> Dict[str, int]:
         """
+        Get the summed counters of every worker.
 
-        def render(self, task: Task) -> RenderableType:
-            percentage = task.percentage
-            if percentage < 20:
-                self.style = "red"
-            elif percentage < 40:
-                self.style = "orange1"
-            elif percentage < 60:
-                self.style = "yellow"
-            elif percentage < 80:
-                self.style = "green"
-            else:
-                self.style = "cyan"
-            return super().render(task)
+        Args:
+            include_local (bool): If True, also add the counters of this process.
+
+        Returns:
+            Dict[str, int]: The counters keyed by name.
+        """
+        with self._lock:
+            totals = dict(self._counters)
+        if include_local:
+            for key, value in list(_counters.items()):
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    @property
+    def workers(self) -> int:
+        """int: The number of distinct worker processes heard from."""
+        return len(self._workers)
+
+    def close(self) -> None:
+        """Merge everything already shipped and stop receiving. Call it after the pool has shut down."""
+        if self._receiver.is_alive():
+            self.queue.put(None)
+            self._receiver.join()
+
+
+class ColorChangingBarColumn(BarColumn):
+    """
+    A custom BarColumn class that changes color dynamically based on the progress percentage.
+    The style thresholds are computed once; rendering does not mutate the column.
+    """
+
+    thresholds: Tuple[float, ...] = (20, 40, 60, 80)
+    styles: Tuple[str, ...] = ("red", "orange1", "yellow", "green", "cyan")
+
+    def render(self, task: Task) -> RenderableType:
+        return BarRenderable(
+            total=max(0, task.total) if task.total is not None else None,
+            completed=max(0, task.completed),
+            width=None if self.bar_width is None else max(1, self.bar_width),
+            pulse=not task.started,
+            animation_time=task.get_time(),
+            style=self.styles[bisect.bisect_right(self.thresholds, task.percentage)],
+            complete_style=self.complete_style,
+            finished_style=self.finished_style,
+            pulse_style=self.pulse_style,
+        )
+
+
+class ProgressHandle:
+    """
+    A cheap progress counter for tight loops. `advance` only adds to a local counter and
+    forwards the accumulated count to rich every `flush_every` items or every
+    `flush_interval` seconds, whichever comes first. `advance` and `update` take the
+    arguments of the underlying rich Progress, so existing `progress.advance(task_id)` and
+    `progress.update(task_id, ...)` calls keep working; the Progress itself is available
+    as `progress`.
+
+    Args:
+        progress (Progress): The rich Progress to forward to.
+        task_id (TaskID): The task advanced by `advance`.
+        flush_every (int): The number of items accumulated before forwarding.
+        flush_interval (float): The longest time, in seconds, items stay accumulated.
+    """
+
+    __slots__ = ('progress', 'task_id', 'flush_every', 'flush_interval', '_pending', '_deadline')
+
+    def __init__(self, progress: Union[Progress, 'HeadlessProgress'], task_id: TaskID, flush_every: int = 1000,
+                 flush_interval: float = 0.1) -> None:
+        self.progress = progress
+        self.task_id = task_id
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._deadline = time.monotonic() + flush_interval
+
+    def advance(self, task_id: Optional[TaskID] = None, advance: float = 1) -> None:
+        """
+        Count more completed items, with the signature of `Progress.advance`. Items of the
+        handle's own task are accumulated; any other task is advanced right away.
+
+        Args:
+            task_id (Optional[TaskID]): The task to advance, defaulting to the handle's task.
+            advance (float): The number of items completed.
+        """
+        if task_id is not None and task_id != self.task_id:
+            self.progress.advance(task_id, advance)
+            return
+        self._pending += advance
+        if self._pending >= self.flush_every or time.monotonic() >= self._deadline:
+            self.flush()
+
+    def flush(self) -> None:
+        """Forward the accumulated items to rich."""
+        if self._pending:
+            self.progress.advance(self.task_id, self._pending)
+            self._pending = 0
+        self._deadline = time.monotonic() + self.flush_interval
+
+    def update(self, task_id: TaskID, **kwargs: Any) -> None:
+        """
+        Flush the accumulated items, then call `Progress.update`.
+
+        Args:
+            task_id (TaskID): The task to update.
+            **kwargs: The arguments of `Progress.update`.
+        """
+        self.flush()
+        self.progress.update(task_id, **kwargs)
+
+
+class HeadlessProgress:
+    """
+    A stand-in for rich's Progress when the output is not an interactive terminal. Nothing is
+    rendered; instead, a one-line summary with throughput, elapsed and remaining time is
+    printed at most once per interval and once more when the progress stops.
+
+    It offers the part of the Progress API used by decorated functions: `add_task`, `update`
+    and `advance`, and it can be used as a context manager.
+
+    Args:
+        interval (float): The minimum time, in seconds, between two summaries.
+        file (Optional[TextIO]): Where summaries are written, defaulting to stdout.
+    """
+
+    def __init__(self, interval: float = 10.0, file: Optional[TextIO] = None) -> None:
+        self.interval = interval
+        self.file = file
+        self._lock = threading.Lock()
+        self._tasks: Dict[int, Dict[str, Any]] = {}
+        self._next_summary = 0.0
+
+    def __enter__(self) -> 'HeadlessProgress':
+        self._next_summary = time.monotonic() + self.interval
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        with self._lock:
+            for task in self._tasks.values():
+                self._summarize(task, time.monotonic())
+
+    def add_task(self, description: str, total: Optional[float] = 100.0, completed: float = 0, **_: Any) -> TaskID:
+        """
+        Add a task to report on.
+
+        Args:
+            description (str): The label of the task.
+            total (Optional[float]): The number of items, or None if unknown.
+            completed (float): The number of items already completed.
+
+        Returns:
+            TaskID: The ID of the task.
+        """
+        with self._lock:
+            task_id = TaskID(len(self._tasks))
+            self._tasks[task_id] = {'description': description, 'total': total,
+                                    'completed': completed, 'start': time.monotonic()}
+            return task_id
+
+    def update(self, task_id: TaskID, total: Optional[float] = None, completed: Optional[float] = None,
+               advance: Optional[float] = None, description: Optional[str] = None, **_: Any) -> None:
+        """
+        Update a task, like `Progress.update`.
+
+        Args:
+            task_id (TaskID): The task to update.
+            total (Optional[float]): A new total.
+            completed (Optional[float]): A new number of completed items.
+            advance (Optional[float]): The number of items to add to the completed ones.
+            description (Optional[str]): A new label.
+        """
+        with self._lock:
+            task = self._tasks[task_id]
+            if total is not None:
+                task['total'] = total
+            if completed is not None:
+                task['completed'] = completed
+            if advance is not None:
+                task['completed'] += advance
+            if description is not None:
+                task['description'] = description
+            self._maybe_summarize()
+
+    def advance(self, task_id: TaskID, advance: float = 1) -> None:
+        """
+        Add to the completed items of a task, like `Progress.advance`.
+
+        Args:
+            task_id (TaskID): The task to advance.
+            advance (float): The number of items completed.
+        """
+        with self._lock:
+            self._tasks[task_id]['completed'] += advance
+            self._maybe_summarize()
 
+    def _maybe_summarize(self) -> None:
+        now = time.monotonic()
+        if now < self._next_summary:
+            return
+        self._next_summary = now + self.interval
+        for task in self._tasks.values():
+            self._summarize(task, now)
+
+    def _summarize(self, task: Dict[str, Any], now: float) -> None:
+        elapsed = now - task['start']
+        completed, total = task['completed'], task['total']
+        rate = completed / elapsed if elapsed > 0 else 0.0
+        line = f"{task['description']}: {completed:g}"
+        if total is not None:
+            line += f"/{total:g} ({100 * completed / total if total else 100:.1f}%)"
+        line += f", {rate:.1f} items/s, elapsed {datetime.timedelta(seconds=int(elapsed))}"
+        if total is not None and rate > 0:
+            line += f", remaining {datetime.timedelta(seconds=int(max(0, total - completed) / rate))}"
+        print(line, file=self.file or sys.stdout, flush=True)
+
+
+def _build_progress(refresh_per_second: float, mode: str = 'auto',
+                    summary_interval: float = 10.0) -> Union[Progress, HeadlessProgress]:
+    if mode not in ('auto', 'rich', 'headless'):
+        raise ValueError(f"Unknown progress mode: {mode}")
+    console = None
+    if mode == 'auto':
+        # rich's own detection also covers Jupyter and its environment overrides, unlike isatty()
+        console = Console()
+        if not (console.is_terminal or console.is_jupyter):
+            mode = 'headless'
+    if mode == 'headless':
+        return HeadlessProgress(summary_interval)
+    return Progress(
+        TextColumn("[white]{task.description}"),
+        ColorChangingBarColumn(bar_width=None),
+        TextColumn("[progress.percentage]{task.percentage:>3.1f}%"),
+        TimeRemainingColumn(),
+        console=console,
+        refresh_per_second=refresh_per_second
+    )
+
+
+def _progress_wrapper(func: Callable, refresh_per_second: float, handle: bool,
+                      flush_every: int, flush_interval: float, mode: str, summary_interval: float) -> Callable:
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         total = kwargs.get('total', 100)
 
-        progress = Progress(
-            TextColumn("[white]{task.description}"),
-            ColorChangingBarColumn(bar_width=None),
-            TextColumn("[progress.percentage]{task.percentage:>3.1f}%"),
-            TimeRemainingColumn()
-        )
+        progress = _build_progress(refresh_per_second, mode, summary_interval)
 
         with progress:
             task_id = progress.add_task(func.__name__, total=total)
-            kwargs['progress'] = progress
+            progress_handle = ProgressHandle(progress, task_id, flush_every, flush_interval) if handle else None
+            kwargs['progress'] = progress_handle or progress
             kwargs['task_id'] = task_id
-            result = func(*args, **kwargs)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                if progress_handle is not None:
+                    progress_handle.flush()
 
         return result
 
     return wrapper
+
+
+# Progress Bar Decorator with dynamic colors
+def ProgressBar(func: Optional[Callable] = None, refresh_per_second: float = 10, handle: bool = False,
+                flush_every: int = 1000, flush_interval: float = 0.1, mode: str = 'auto',
+                summary_interval: float = 10.0):
+    """
+    A decorator to add a progress bar to a function, with dynamic colors based on the progress percentage.
+
+    The decorated function receives the rich `progress` and its `task_id` as keyword arguments.
+    With `handle=True`, `progress` is a ProgressHandle whose `advance()` amortizes the updates,
+    which keeps the bookkeeping cheap in loops with millions of iterations.
+
+    When rich's console is neither a terminal nor Jupyter, or with `mode="headless"`, rich is
+    skipped entirely: `progress` is a HeadlessProgress that prints a periodic one-line summary instead.
+
+    Args:
+        func (Callable): The function to be decorated.
+        refresh_per_second (float): How many times per second the bar is redrawn.
+        handle (bool): If True, pass a ProgressHandle as `progress`.
+        flush_every (int): The number of items a ProgressHandle accumulates before forwarding them.
+        flush_interval (float): The longest time, in seconds, a ProgressHandle keeps items accumulated.
+        mode (str): "auto" to render with rich where rich detects a terminal or Jupyter, "rich" or "headless".
+        summary_interval (float): The time, in seconds, between two summaries in headless mode.
+
+    Returns:
+        Callable: The decorated function with a progress bar.
+
+    Raises:
+        ValueError: If mode is unknown, when the decorated function is called.
+    """
+    if callable(func):
+        return _progress_wrapper(func, refresh_per_second, handle, flush_every, flush_interval,
+                                 mode, summary_interval)
+
+    def decorator(__func):
+        return _progress_wrapper(__func, refresh_per_second, handle, flush_every, flush_interval,
+                                 mode, summary_interval)
+
+    return decorator
+
+
+def _run_chunk(func: Callable, chunk: List[Any]) -> List[Any]:
+    return [func(item) for item in chunk]
+
+
+def _chunked(iterable: Iterable[Any], chunksize: int) -> Iterator[List[Any]]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def progress_map(func: Callable, iterable: Iterable[Any], backend: str = 'thread',
+                 max_workers: Optional[int] = None, chunksize: int = 1, ordered: bool = True,
+                 total: Optional[int] = None, description: Optional[str] = None,
+                 refresh_per_second: float = 10, mode: str = 'auto',
+                 summary_interval: float = 10.0) -> Iterator[Any]:
+    """
+    Apply a function to every item of an iterable in a thread or process pool, showing one
+    progress bar for all workers. Results are streamed back lazily as they become available.
+
+    Items are sent to the workers in chunks and the bar advances once per finished chunk,
+    so there is no round trip per item. Only a bounded number of chunks is in flight at a
+    time, so the iterable is consumed lazily as well.
+
+    Args:
+        func (Callable): The function to apply. With the process backend it must be picklable.
+        iterable (Iterable[Any]): The items.
+        backend (str): "thread" or "process".
+        max_workers (Optional[int]): The pool size, or None for the executor's default.
+        chunksize (int): The number of items sent to a worker at once.
+        ordered (bool): If True, results are yielded in input order; otherwise as soon as they are ready.
+        total (Optional[int]): The number of items, if the iterable has no len().
+        description (Optional[str]): The label of the bar, defaulting to the function name.
+        refresh_per_second (float): How many times per second the bar is redrawn.
+        mode (str): "auto" to render with rich where rich detects a terminal or Jupyter, "rich" or "headless".
+        summary_interval (float): The time, in seconds, between two summaries in headless mode.
+
+    Returns:
+        Iterator[Any]: The results.
+
+    Raises:
+        ValueError: If backend or mode is unknown, or chunksize is smaller than 1.
+    """
+    if backend == 'thread':
+        executor_type: Callable[..., Executor] = ThreadPoolExecutor
+    elif backend == 'process':
+        executor_type = ProcessPoolExecutor
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if total is None and hasattr(iterable, '__len__'):
+        total = len(iterable)
+
+    progress = _build_progress(refresh_per_second, mode, summary_interval)
+
+    def generate() -> Iterator[Any]:
+        with progress, executor_type(max_workers=max_workers) as executor:
+            task_id = progress.add_task(description or getattr(func, '__name__', 'map'), total=total)
+            window = 2 * getattr(executor, '_max_workers', os.cpu_count() or 1)
+            chunks = _chunked(iterable, chunksize)
+            pending: 'deque[Future]' = deque()
+            running: set = set()
+
+            def submit() -> bool:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return False
+                future = executor.submit(_run_chunk, func, chunk)
+                future.add_done_callback(lambda done, size=len(chunk): progress.advance(task_id, size))
+                if ordered:
+                    pending.append(future)
+                running.add(future)
+                return True
+
+            try:
+                while len(running) < window and submit():
+                    pass
+                while running:
+                    if ordered:
+                        future = pending.popleft()
+                    else:
+                        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                        future = finished.pop()
+                    results = future.result()
+                    running.discard(future)
+                    submit()
+                    yield from results
+            finally:
+                for future in running:
+                    future.cancel()
+
+    return generate()
@@ -1,159 +1,1398 @@
 # jh_decorators/reflection.py
 
+import array
+import datetime
+import decimal
+import enum
+import functools
+import inspect
+import io
+import itertools
 import json
+import operator
+import os
+import re
+import struct
+import types
+import typing
+import xml.etree.ElementTree as ElementTree
 import yaml
 import xmltodict
-from functools import wraps
-from typing import Type, Any, Callable, cast, Dict, List
+from typing import Type, Any, Callable, cast, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, \
+    Union
 
-# Global dictionaries to store classes decorated with Jsonize and Dictize
+# Names of the decorated classes per module and format, kept alongside reflected_classes
 jsonized_classes: Dict[str, List[str]] = {}
 dictized_classes: Dict[str, List[str]] = {}
 xmlized_classes: Dict[str, List[str]] = {}
 yamlized_classes: Dict[str, List[str]] = {}
+packized_classes: Dict[str, List[str]] = {}
 
+# Name of the class attribute holding the cached _ClassSpec
+_SPEC_ATTRIBUTE = '__reflection_spec__'
 
-def Jsonize(cls: Type) -> Type:
+# Slot of lazy proxies holding the raw values of fields not read yet
+_PENDING_SLOT = '__reflection_pending__'
+
+# Key of the type tag naming the class of a serialized instance
+_TYPE_TAG = '$type'
+
+
+def _dynamic_fields(self: Any) -> dict:
+    """Collect every non-callable instance attribute, from slots and __dict__ alike."""
+    data = {}
+    for name in _get_spec(type(self)).slots:
+        try:
+            value = getattr(self, name)
+        except AttributeError:
+            continue
+        if not callable(value):
+            data[name] = value
+    d = getattr(self, '__dict__', None)
+    if d:
+        data.update({k: v for k, v in d.items() if not callable(v)})
+    return data
+
+
+def _is_class_var(annotation: Any) -> bool:
+    if isinstance(annotation, str):
+        return annotation.split('[', 1)[0].strip() in ('ClassVar', 'typing.ClassVar')
+    return annotation is typing.ClassVar or typing.get_origin(annotation) is typing.ClassVar
+
+
+def _own_annotations(cls: Type) -> List[str]:
+    """Names annotated in the body of cls itself, excluding ClassVar."""
+    return [name for name, annotation in vars(cls).get('__annotations__', {}).items()
+            if not _is_class_var(annotation)]
+
+
+def _slot_names(cls: Type) -> Tuple[str, ...]:
+    """Attribute names stored in slots anywhere in the MRO, with private names mangled."""
+    names: Dict[str, None] = {}
+    for base in reversed(cls.__mro__):
+        slots = vars(base).get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name in ('__dict__', '__weakref__', _PENDING_SLOT):
+                continue
+            if name.startswith('__') and not name.endswith('__'):
+                name = f"_{base.__name__.lstrip('_')}{name}"
+            names[name] = None
+    return tuple(names)
+
+
+def _declared_fields(cls: Type) -> Tuple[str, ...]:
+    """
+    Field names declared by a class: its annotations across the MRO, or else the named
+    parameters of its __init__. An empty tuple means fields are only known per instance.
+    """
+    fields: Dict[str, None] = {}
+    for base in reversed(cls.__mro__):
+        fields.update(dict.fromkeys(_own_annotations(base)))
+    if fields:
+        return tuple(fields)
+
+    try:
+        parameters = list(inspect.signature(cls.__init__).parameters.values())[1:]
+    except (TypeError, ValueError):
+        return ()
+    if any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parameters):
+        return ()
+    return tuple(p.name for p in parameters)
+
+
+def _compile_encoder(cls: Type, fields: Tuple[str, ...],
+                     slots: Tuple[str, ...]) -> Tuple[Callable[[Any], dict], Callable[..., dict]]:
+    """
+    Generate the encoder of a class and its to_dict method. Slots are read as plain attribute
+    loads and __dict__ is copied in one call; instances of subclasses are handed to their own
+    spec, and any other instance, including one holding a callable that must be left out,
+    falls back to _dynamic_fields.
+
+    The to_dict method returns that copy as it is when every value is a str, int, float, bool
+    or None, a single scan that also rules out callables; anything else, and shared or tagged
+    output, goes through _to_plain.
+    """
+    has_dict = cls.__dictoffset__ != 0
+
+    ordered_slots = [name for name in fields if name in slots] + [name for name in slots if name not in fields]
+    items = ''.join(f'{name!r}: self.{name}, ' for name in ordered_slots)
+
+    def fast_path(accepted: str, indent: str) -> str:
+        if not has_dict:
+            lines = ["try:", f"    data = {{{items}}}", "except AttributeError:", "    pass", "else:",
+                     f"    if {accepted}:", "        return data"]
+        elif slots and not fields:
+            # Fields only known per instance, some of them in slots that may be unset
+            return ''
+        else:
+            # Every non-callable attribute in __dict__ is kept, as _dynamic_fields does
+            lines = [f"data = {{{items}**self.__dict__}}" if items else "data = self.__dict__.copy()",
+                     f"if {accepted}:", "    return data"]
+            if items:
+                lines = ["try:", *(f"    {line}" for line in lines), "except AttributeError:", "    pass"]
+        return ''.join(f"{indent}{line}\n" for line in lines)
+
+    source = (
+        "def to_dict(self) -> dict:\n"
+        "    if type(self) is not cls:\n"
+        "        return _get_spec(type(self)).encode(self)\n"
+        f"{fast_path('not any(map(callable, data.values()))', '    ')}"
+        "    return _dynamic_fields(self)\n"
+        "def plain(self, shared=False, tagged=False) -> dict:\n"
+        "    if type(self) is cls and not (shared or tagged):\n"
+        f"{fast_path('_LEAF_TYPES.issuperset(map(type, data.values()))', '        ')}"
+        "        pass\n"
+        "    return _to_plain(to_dict, self, shared, tagged)\n"
+    )
+    namespace: Dict[str, Any] = {'cls': cls, '_LEAF_TYPES': _LEAF_TYPES, '_get_spec': _get_spec,
+                                 '_dynamic_fields': _dynamic_fields, '_to_plain': _to_plain}
+    exec(compile(source, f"<reflection encoder {cls.__qualname__}>", 'exec'), namespace)
+    encoder, plain = namespace['to_dict'], namespace['plain']
+    for function in (encoder, plain):
+        function.__qualname__ = f"{cls.__qualname__}.to_dict"
+        function.__module__ = cls.__module__
+    return encoder, plain
+
+
+def _field_types(cls: Type, fields: Tuple[str, ...], include_extras: bool = False) -> Dict[str, Any]:
+    """
+    Resolved type hints of the declared fields, from the class annotations or, failing
+    that, the __init__ parameters. Hints that cannot be resolved are left out.
+    """
+    hints: Dict[str, Any] = {}
+    for source in (cls.__init__, cls):
+        try:
+            hints.update(typing.get_type_hints(source, include_extras=include_extras))
+        except Exception:
+            continue
+    return {name: hints[name] for name in fields if name in hints}
+
+
+_TRUE_STRINGS = frozenset(('true', '1', 'yes', 'on'))
+_FALSE_STRINGS = frozenset(('false', '0', 'no', 'off', ''))
+
+
+def _text_to_bool(text: str) -> bool:
+    lowered = text.strip().lower()
+    if lowered in _TRUE_STRINGS:
+        return True
+    if lowered in _FALSE_STRINGS:
+        return False
+    raise ValueError(f"Cannot convert {text!r} to bool")
+
+
+def _text_converter(hint: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Build a converter from parsed text (a string, or a list of them for repeated elements)
+    to the hinted type. Returns None when values should be passed through unchanged.
+    """
+    origin = typing.get_origin(hint)
+    if origin in (Union, types.UnionType):
+        members = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        return _text_converter(members[0]) if len(members) == 1 else None
+    if origin in (list, tuple, set, frozenset):
+        args = typing.get_args(hint)
+        item = _text_converter(args[0]) if args else None
+        container = origin
+
+        def convert_items(value: Any) -> Any:
+            values = value if isinstance(value, list) else [value]
+            return container(values if item is None else [v if v is None else item(v) for v in values])
+
+        return convert_items
+    if hint is bool:
+        return _text_to_bool
+    if hint in (int, float, complex, decimal.Decimal):
+        return hint
+    if hint in (datetime.datetime, datetime.date, datetime.time):
+        return hint.fromisoformat
+    if _is_reflected(hint):
+        def convert_nested(value: Any) -> Any:
+            if not isinstance(value, dict):
+                return value
+            return hint(**_get_spec(hint).coerce_text(value))
+
+        return convert_nested
+    if isinstance(hint, type) and issubclass(hint, enum.Enum):
+        def convert_enum(value: Any) -> Any:
+            try:
+                return hint(value)
+            except ValueError:
+                # str() of a member, as written by to_xml
+                return hint[value.rpartition('.')[2]]
+
+        return convert_enum
+    return None
+
+
+def _is_reflected(hint: Any) -> bool:
+    """Whether hint is a class decorated by one of the reflection decorators, or a subclass of one."""
+    return isinstance(hint, type) and getattr(hint, _SPEC_ATTRIBUTE, None) is not None
+
+
+def _nested_decoder(hint: Any) -> Optional[Callable[[Any, dict], Any]]:
+    """
+    Build a decoder rebuilding reflected instances inside a value of the hinted type.
+    Returns None when the value holds no reflected class and is passed through unchanged.
+    """
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if origin in (Union, types.UnionType):
+        members = [arg for arg in args if arg is not type(None)]
+        return _nested_decoder(members[0]) if len(members) == 1 else None
+    if origin in (list, tuple, set, frozenset):
+        item = _nested_decoder(args[0]) if args else None
+        if item is None:
+            return None
+        container = origin
+        return lambda value, refs: container([item(v, refs) for v in value]) if isinstance(value, list) else value
+    if origin is dict:
+        item = _nested_decoder(args[1]) if len(args) == 2 else None
+        if item is None:
+            return None
+        return lambda value, refs: {k: item(v, refs) for k, v in value.items()} if isinstance(value, dict) else value
+    if _is_reflected(hint):
+        return lambda value, refs: _get_spec(hint).load(value, refs) if isinstance(value, dict) else value
+    return None
+
+
+# Types that never contain reflected instances
+_LEAF_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+class _GraphEncoder:
+    """
+    Converts an instance and everything reachable from it into plain dictionaries and lists.
+
+    Without sharing, an instance reached again while it is still being encoded is a cycle
+    and raises ValueError. With sharing, a first pass counts how often every instance is
+    reached; instances reached more than once are written in full once, tagged with "$id",
+    and as {"$ref": id} everywhere else, which also covers cycles.
+    """
+
+    __slots__ = ('counts', 'ids', 'active')
+
+    def __init__(self, root: Any, shared: bool) -> None:
+        self.counts: Optional[Dict[int, int]] = self._count(root) if shared else None
+        self.ids: Dict[int, int] = {}
+        self.active: set = set()
+
+    @staticmethod
+    def _count(root: Any) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        pending = [root]
+        while pending:
+            value = pending.pop()
+            if type(value) in _LEAF_TYPES:
+                continue
+            if isinstance(value, (list, tuple)):
+                pending.extend(value)
+            elif isinstance(value, dict):
+                pending.extend(value.values())
+            elif _is_reflected(type(value)):
+                key = id(value)
+                if key in counts:
+                    counts[key] += 1
+                else:
+                    counts[key] = 1
+                    pending.extend(_get_spec(type(value)).encode(value).values())
+        return counts
+
+    def value(self, value: Any) -> Any:
+        value_type = type(value)
+        if value_type in _LEAF_TYPES:
+            return value
+        if isinstance(value, list):
+            return [self.value(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self.value(item) for item in value)
+        if isinstance(value, dict):
+            return {key: self.value(item) for key, item in value.items()}
+        if _is_reflected(value_type):
+            return self.instance(value)
+        return value
+
+    def instance(self, instance: Any, data: Optional[dict] = None) -> dict:
+        key = id(instance)
+        ident = 0
+        if self.counts is not None:
+            if key in self.ids:
+                return {'$ref': self.ids[key]}
+            if self.counts.get(key, 1) > 1:
+                ident = self.ids[key] = len(self.ids) + 1
+        elif key in self.active:
+            raise ValueError(f"Cycle detected at a {type(instance).__qualname__} instance; "
+                             f"pass shared=True to encode it with $id/$ref")
+
+        self.active.add(key)
+        if data is None:
+            data = _get_spec(type(instance)).encode(instance)
+        result = {name: self.value(value) for name, value in data.items()}
+        self.active.discard(key)
+        return {'$id': ident, **result} if ident else result
+
+
+def _to_plain(encode: Callable[[Any], dict], instance: Any, shared: bool = False, tagged: bool = False) -> dict:
+    """
+    Convert an instance to a dictionary, recursing into nested reflected instances, lists,
+    tuples and dicts. Flat instances, the common case, cost a single type scan. With tagged,
+    the result starts with the type tag of the instance.
+    """
+    data = encode(instance)
+    if shared or not _LEAF_TYPES.issuperset(map(type, data.values())):
+        data = _GraphEncoder(instance, shared).instance(instance, data)
+    if tagged:
+        data = {_TYPE_TAG: _get_spec(type(instance)).tag, **data}
+    return data
+
+
+def _takes_fields_positionally(cls: Type, fields: Tuple[str, ...]) -> bool:
+    """Whether cls(*values) hands values to __init__ in the order of fields."""
+    try:
+        parameters = list(inspect.signature(cls).parameters.values())
+    except (TypeError, ValueError):
+        return False
+    return (tuple(p.name for p in parameters) == fields
+            and all(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in parameters))
+
+
+def _row_constructor(cls: Type, names: Tuple[str, ...]) -> Callable[..., Any]:
+    """
+    A function taking one positional value per name and returning cls built from them:
+    cls itself when its __init__ takes the names in order, else a generated keyword call.
+    """
+    if _takes_fields_positionally(cls, names):
+        return cls
+    if not all(name.isidentifier() for name in names):
+        return lambda *values: cls(**dict(zip(names, values)))
+    values = [f"v{i}" for i in range(len(names))]
+    source = (f"def make({', '.join(values)}):\n"
+              f"    return cls({', '.join(f'{name}={value}' for name, value in zip(names, values))})\n")
+    namespace: Dict[str, Any] = {'cls': cls}
+    exec(compile(source, f"<reflection constructor {cls.__qualname__}>", 'exec'), namespace)
+    return namespace['make']
+
+
+# array typecodes standing in for struct codes the array module lacks
+_ARRAY_TYPECODES = {'?': 'b', 'e': 'f'}
+
+
+class _ColumnPlan:
+    """
+    Per-class plan for converting between instances and columns: one attrgetter per
+    declared field, the typecode of each numeric field, and cached row constructors.
+    """
+
+    __slots__ = ('cls', 'fields', 'getters', 'typecodes', 'constructors')
+
+    def __init__(self, cls: Type, fields: Tuple[str, ...]) -> None:
+        self.cls = cls
+        self.fields = fields
+        self.getters = {name: operator.attrgetter(name) for name in fields}
+        self.typecodes: Dict[str, str] = {}
+        for name, hint in _field_types(cls, fields, include_extras=True).items():
+            try:
+                code, text = _pack_code(name, hint)
+            except TypeError:
+                continue
+            if text is None:
+                self.typecodes[name] = code
+        self.constructors: Dict[Tuple[str, ...], Callable[..., Any]] = {}
+
+    def to_columns(self, instances: Iterable[Any], kind: str) -> Dict[str, Any]:
+        items = instances if isinstance(instances, (list, tuple)) else list(instances)
+        getters = self.getters
+        if not getters and items:
+            # Fields only known per instance
+            getters = {name: operator.attrgetter(name) for name in _get_spec(type(items[0])).encode(items[0])}
+        columns = {name: list(map(getter, items)) for name, getter in getters.items()}
+
+        if kind == 'list':
+            return columns
+        if kind == 'array':
+            for name, code in self.typecodes.items():
+                columns[name] = array.array(_ARRAY_TYPECODES.get(code, code), columns[name])
+            return columns
+        if kind == 'numpy':
+            try:
+                import numpy
+            except ImportError:
+                raise ImportError("to_columns(kind='numpy') requires NumPy to be installed") from None
+            return {name: numpy.array(column, dtype=self.typecodes.get(name)) for name, column in columns.items()}
+        raise ValueError(f"Unknown column kind: {kind!r}, expected 'list', 'array' or 'numpy'")
+
+    def from_columns(self, columns: Dict[str, Any]) -> List[Any]:
+        if not columns:
+            # What to_columns returns for no instances of a class whose fields are only known per instance
+            return []
+        names = tuple(columns)
+        values = []
+        for name, column in columns.items():
+            if isinstance(column, array.array) and self.typecodes.get(name) == '?':
+                # Stored as signed bytes by to_columns(kind='array')
+                column = list(map(bool, column))
+            values.append(column.tolist() if hasattr(column, 'tolist') else column)
+        if len({len(column) for column in values}) > 1:
+            raise ValueError("All columns must have the same length")
+        constructor = self.constructors.get(names)
+        if constructor is None:
+            constructor = self.constructors[names] = _row_constructor(self.cls, names)
+        return list(map(constructor, *values))
+
+
+class _ClassSpec:
+    """
+    Serialization plan of one class, built once and cached on the class.
+
+    Attributes:
+        cls (Type): The described class.
+        fields (Tuple[str, ...]): Declared field names, empty if they are only known per instance.
+        slots (Tuple[str, ...]): Attribute names stored in slots anywhere in the MRO.
+        encode (Callable[[Any], dict]): Converts an instance of cls to a dictionary.
+        plain (Callable[..., dict]): to_dict of cls, also converting nested instances.
+    """
+
+    __slots__ = ('cls', 'fields', 'slots', 'encode', 'plain', '_coerce_text', '_decoders', '_columns', '_lazy', '_tag')
+
+    def __init__(self, cls: Type) -> None:
+        self.cls = cls
+        self.fields = _declared_fields(cls)
+        self.slots = _slot_names(cls)
+        self.encode, self.plain = _compile_encoder(cls, self.fields, self.slots)
+        self._coerce_text: Optional[Callable[[dict], dict]] = None
+        self._decoders: Optional[Dict[str, Callable[[Any, dict], Any]]] = None
+        self._columns: Optional[_ColumnPlan] = None
+        self._lazy: Optional[Tuple[Type, Tuple[str, ...]]] = None
+        self._tag: Optional[str] = None
+
+    @property
+    def columns(self) -> '_ColumnPlan':
+        """The column plan of the class, built on first use."""
+        if self._columns is None:
+            self._columns = _ColumnPlan(self.cls, self.fields)
+        return self._columns
+
+    @property
+    def tag(self) -> str:
+        """The type tag of the class, registering it on first use if it was not decorated itself."""
+        if self._tag is None:
+            self._tag = _register(self.cls)
+        return self._tag
+
+    def load(self, data: dict, refs: dict) -> Any:
+        """
+        Build an instance from a dictionary, rebuilding nested reflected instances from the
+        field type hints and resolving "$id"/"$ref" through refs. An instance carrying "$id"
+        is allocated before its fields are decoded and initialised afterwards, so references
+        back to it, including cycles, resolve to the same object.
+        """
+        if '$ref' in data:
+            try:
+                return refs[data['$ref']]
+            except KeyError:
+                raise ValueError(f"Unknown reference: {data['$ref']!r}") from None
+
+        decoders = self.decoders()
+        ident = data.get('$id')
+        if ident is None and not decoders and _TYPE_TAG not in data:
+            return self.cls(**data)
+
+        kwargs = dict(data)
+        kwargs.pop(_TYPE_TAG, None)
+        instance = None
+        if ident is not None:
+            del kwargs['$id']
+            instance = refs[ident] = self.cls.__new__(self.cls)
+        # In document order, which is where the encoder wrote "$id" before any "$ref" to it
+        for name, value in kwargs.items():
+            decoder = decoders.get(name)
+            if decoder is not None:
+                kwargs[name] = decoder(value, refs)
+        if instance is None:
+            return self.cls(**kwargs)
+        instance.__init__(**kwargs)
+        return instance
+
+    def decoders(self) -> Dict[str, Callable[[Any, dict], Any]]:
+        """Decoders of the fields that hold nested reflected instances, built on first use."""
+        if self._decoders is None:
+            self._decoders = {name: decoder for name, hint in _field_types(self.cls, self.fields).items()
+                              if (decoder := _nested_decoder(hint)) is not None}
+        return self._decoders
+
+    def load_lazy(self, data: dict, fields: Optional[Iterable[str]] = None) -> Any:
+        """
+        Build a lazy proxy of cls from a dictionary without running __init__. Each field is
+        decoded and stored on first access; with fields, only those keys are kept. Documents
+        using "$id"/"$ref" are rebuilt eagerly.
+        """
+        if '$id' in data or '$ref' in data:
+            return self.load(data, {})
+        if self._lazy is None:
+            self._lazy = _lazy_class(self)
+        proxy, shadowed = self._lazy
+
+        instance = proxy.__new__(proxy)
+        if fields is None:
+            pending = dict(data)
+            pending.pop(_TYPE_TAG, None)
+        else:
+            pending = {name: data[name] for name in fields if name in data}
+        setattr(instance, _PENDING_SLOT, pending)
+        for name in shadowed:
+            # A class attribute would hide the pending value from __getattr__
+            if name in pending:
+                proxy.__getattr__(instance, name)
+        return instance
+
+    def coerce_text(self, data: dict) -> dict:
+        """
+        Convert the text values of a parsed document to the annotated field types, in place.
+        The converters are built from the type hints on first use, when forward references
+        can be resolved.
+        """
+        if self._coerce_text is None:
+            converters = tuple((name, converter) for name, hint in _field_types(self.cls, self.fields).items()
+                               if (converter := _text_converter(hint)) is not None)
+
+            def coerce_text(data: dict) -> dict:
+                for name, converter in converters:
+                    value = data.get(name)
+                    if value is not None:
+                        data[name] = converter(value)
+                return data
+
+            self._coerce_text = coerce_text
+        return self._coerce_text(data)
+
+
+def _lazy_class(spec: _ClassSpec) -> Tuple[Type, Tuple[str, ...]]:
+    """
+    Create the lazy proxy subclass of spec.cls, and list the fields shadowed by class
+    attributes, which must be read eagerly. The proxy keeps raw values in a slot, decodes a
+    field in __getattr__ the first time it is missing, and reads every pending field before
+    it is serialized. Pickling or copying a proxy gives a plain instance of spec.cls.
+    """
+    cls = spec.cls
+    base_getattr = getattr(cls, '__getattr__', None)
+    decoders: Optional[Dict[str, Callable[[Any, dict], Any]]] = None
+
+    def __getattr__(self: Any, name: str) -> Any:
+        nonlocal decoders
+        try:
+            pending = object.__getattribute__(self, _PENDING_SLOT)
+        except AttributeError:
+            pending = {}
+        if name in pending:
+            if decoders is None:
+                decoders = spec.decoders()
+            value = pending.pop(name)
+            decoder = decoders.get(name)
+            if decoder is not None:
+                value = decoder(value, {})
+            setattr(self, name, value)
+            return value
+        if base_getattr is not None:
+            return base_getattr(self, name)
+        raise AttributeError(f"{cls.__name__!r} object has no attribute {name!r}")
+
+    def __repr__(self: Any) -> str:
+        return f"<lazy {cls.__qualname__} proxy, {len(getattr(self, _PENDING_SLOT))} fields pending>"
+
+    def __reduce_ex__(self: Any, protocol: int = 0) -> tuple:
+        # The proxy class cannot be found by name, so pickle and copy a real instance instead
+        return _restore_lazy, (cls, encode_proxy(self))
+
+    namespace: Dict[str, Any] = {'__slots__': (_PENDING_SLOT,), '__getattr__': __getattr__,
+                                 '__reduce__': __reduce_ex__, '__reduce_ex__': __reduce_ex__,
+                                 '__module__': cls.__module__, '__qualname__': cls.__qualname__}
+    if cls.__repr__ is object.__repr__:
+        namespace['__repr__'] = __repr__
+    proxy = type(cls)(cls.__name__, (cls,), namespace)
+
+    proxy_spec = _ClassSpec(proxy)
+    encode = proxy_spec.encode
+
+    def encode_proxy(self: Any) -> dict:
+        for name in list(getattr(self, _PENDING_SLOT)):
+            __getattr__(self, name)
+        return encode(self)
+
+    def plain(self: Any, shared: bool = False, tagged: bool = False) -> dict:
+        return _to_plain(encode_proxy, self, shared, tagged)
+
+    proxy_spec.encode = encode_proxy
+    proxy_spec.plain = plain
+    proxy_spec._tag = spec.tag
+    setattr(proxy, _SPEC_ATTRIBUTE, proxy_spec)
+
+    shadowed = tuple(name for name in spec.fields if hasattr(cls, name) and name not in spec.slots)
+    return proxy, shadowed
+
+
+def _restore_lazy(cls: Type, data: dict) -> Any:
+    """Build an instance of cls holding the fields of a lazy proxy, without running __init__."""
+    instance = cls.__new__(cls)
+    for name, value in data.items():
+        setattr(instance, name, value)
+    return instance
+
+
+def _get_spec(cls: Type) -> _ClassSpec:
+    """Return the _ClassSpec of a class, building it on first use."""
+    spec = cls.__dict__.get(_SPEC_ATTRIBUTE)
+    if spec is None:
+        spec = _ClassSpec(cls)
+        setattr(cls, _SPEC_ATTRIBUTE, spec)
+    return spec
+
+
+def _make_slotted(cls: Type) -> Type:
+    """
+    Rebuild cls with __slots__ for the fields annotated in its body, the way
+    dataclass(slots=True) does. Class-level defaults of those fields are dropped, since a
+    slot and a class attribute cannot share a name; __init__ must assign every field.
+    Classes that already define __slots__ are returned unchanged.
+    """
+    if '__slots__' in cls.__dict__:
+        return cls
+
+    inherited = set(_slot_names(cls))
+    slots = tuple(name for name in _own_annotations(cls) if name not in inherited)
+    namespace = {k: v for k, v in cls.__dict__.items()
+                 if k not in slots and k not in ('__dict__', '__weakref__', _SPEC_ATTRIBUTE)}
+    namespace['__slots__'] = slots
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+
+    # Zero-argument super() in methods refers to the class through a __class__ cell
+    for member in namespace.values():
+        if isinstance(member, (classmethod, staticmethod)):
+            member = member.__func__
+        functions = [member.fget, member.fset, member.fdel] if isinstance(member, property) else [member]
+        for function in functions:
+            closure = getattr(function, '__closure__', None) or ()
+            for name, cell in zip(function.__code__.co_freevars if closure else (), closure):
+                if name == '__class__' and cell.cell_contents is cls:
+                    cell.cell_contents = slotted
+    return slotted
+
+
+class Backend:
+    """
+    A serialization backend for one text format.
+
+    Attributes:
+        name (str): The name the backend is registered under.
+        dumps (Callable[[Any], str]): Serializes a value to a string.
+        loads (Callable[[Any], Any]): Parses a string or bytes.
+        dump_all (Optional[Callable[[List[Any]], str]]): Serializes a list of documents, for YAML streams.
+        load_all (Optional[Callable[[Any], Iterator[Any]]]): Lazily parses documents from a stream, for YAML streams.
+    """
+
+    __slots__ = ('name', 'dumps', 'loads', 'dump_all', 'load_all')
+
+    def __init__(self, name: str, dumps: Callable[[Any], str], loads: Callable[[Any], Any],
+                 dump_all: Optional[Callable[[List[Any]], str]] = None,
+                 load_all: Optional[Callable[[Any], Iterator[Any]]] = None) -> None:
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.dump_all = dump_all
+        self.load_all = load_all
+
+    def __repr__(self) -> str:
+        return f"Backend({self.name!r})"
+
+
+# Registered backends per format, fastest first, and the backend currently used by default
+_backends: Dict[str, Dict[str, Backend]] = {'json': {}, 'yaml': {}}
+_active_backends: Dict[str, Backend] = {}
+
+
+def register_backend(format: str, backend: Backend) -> None:
+    """
+    Register a serialization backend. The first backend registered for a format is the
+    default until set_backend selects another one.
+
+    Args:
+        format (str): 'json' or 'yaml'.
+        backend (Backend): The backend to register.
+    """
+    if format not in _backends:
+        raise ValueError(f"Unknown format: {format!r}, expected one of {sorted(_backends)}")
+    _backends[format][backend.name] = backend
+    _active_backends.setdefault(format, backend)
+
+
+def get_backend(format: str, name: Optional[str] = None) -> Backend:
+    """
+    Look up a registered backend.
+
+    Args:
+        format (str): 'json' or 'yaml'.
+        name (Optional[str]): The backend name. If None, the current default is returned.
+
+    Returns:
+        Backend: The requested backend.
+
+    Raises:
+        ValueError: If the format or backend is not registered.
+    """
+    if name is None:
+        return _active_backends[format]
+    try:
+        return _backends[format][name]
+    except KeyError:
+        raise ValueError(f"Unknown {format} backend: {name!r}, "
+                         f"available: {list(_backends.get(format, {}))}") from None
+
+
+def set_backend(format: str, name: str) -> None:
+    """
+    Select the default backend of a format, for every class that did not choose its own.
+
+    Args:
+        format (str): 'json' or 'yaml'.
+        name (str): The name of a registered backend.
+    """
+    _active_backends[format] = get_backend(format, name)
+
+
+def available_backends(format: str) -> List[str]:
+    """
+    Names of the registered backends of a format, fastest first.
+
+    Args:
+        format (str): 'json' or 'yaml'.
+
+    Returns:
+        List[str]: The backend names.
+    """
+    return list(_backends[format])
+
+
+# A run of digits that may not fit in 64 bits, which orjson would parse as a float
+_LONG_DIGITS = re.compile(r'\d{19}')
+_LONG_DIGITS_BYTES = re.compile(rb'\d{19}')
+
+
+def _register_default_backends() -> None:
+    """
+    Register every importable backend, fastest first; the standard ones are always available.
+    The fastest one is the default. orjson and ujson write compact JSON, and set_backend('json',
+    'json') gives the standard module's output whatever is installed.
+    """
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        # Dates, dataclasses and subclasses of builtins go to the json fallback, which rejects
+        # or converts them exactly as the json backend does
+        orjson_options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | \
+            orjson.OPT_PASSTHROUGH_SUBCLASS
+
+        def orjson_dumps(data: Any) -> str:
+            try:
+                text = orjson.dumps(data, option=orjson_options)
+            except TypeError:
+                # Integers beyond 64 bits, non-string keys and the types passed through above
+                return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+            # orjson writes NaN and infinities as null, where json writes NaN/Infinity, which
+            # round-trip; reading the text back is a C-level check that no value was changed
+            if b'null' in text and orjson.loads(text) != data:
+                return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+            return text.decode('utf-8')
+
+        def orjson_loads(text: Any) -> Any:
+            if (_LONG_DIGITS if isinstance(text, str) else _LONG_DIGITS_BYTES).search(text):
+                return json.loads(text)
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
+                # NaN and Infinity, as written by json
+                return json.loads(text)
+
+        register_backend('json', Backend('orjson', orjson_dumps, orjson_loads))
+
+    try:
+        import ujson
+    except ImportError:
+        pass
+    else:
+        def ujson_dumps(data: Any) -> str:
+            try:
+                return ujson.dumps(data, escape_forward_slashes=False)
+            except (TypeError, OverflowError):
+                # Integers beyond 64 bits, NaN and infinities, and types ujson cannot encode
+                return json.dumps(data, separators=(',', ':'))
+
+        def ujson_loads(text: Any) -> Any:
+            try:
+                return ujson.loads(text)
+            except ValueError:
+                return json.loads(text)
+
+        register_backend('json', Backend('ujson', ujson_dumps, ujson_loads))
+
+    register_backend('json', Backend('json', json.dumps, json.loads))
+
+    def yaml_backend(name: str, dumper: Any, loader: Any) -> Backend:
+        return Backend(name,
+                       functools.partial(yaml.dump, Dumper=dumper),
+                       functools.partial(yaml.load, Loader=loader),
+                       functools.partial(yaml.dump_all, Dumper=dumper, explicit_start=True),
+                       functools.partial(yaml.load_all, Loader=loader))
+
+    if hasattr(yaml, 'CSafeLoader') and hasattr(yaml, 'CDumper'):
+        register_backend('yaml', yaml_backend('libyaml', yaml.CDumper, yaml.CSafeLoader))
+    register_backend('yaml', yaml_backend('pyyaml', yaml.Dumper, yaml.SafeLoader))
+
+
+_register_default_backends()
+
+
+class RegisteredClass:
+    """
+    An entry of the class registry.
+
+    Attributes:
+        cls (Type): The registered class.
+        formats (Set[str]): The formats it supports: 'json', 'dict', 'xml', 'yaml' and 'pack'.
+    """
+
+    __slots__ = ('cls', 'formats')
+
+    def __init__(self, cls: Type, formats: Set[str]) -> None:
+        self.cls = cls
+        self.formats = formats
+
+    def __repr__(self) -> str:
+        return f"RegisteredClass({self.cls.__qualname__}, {sorted(self.formats)})"
+
+
+# Every reflected class, indexed by qualified name ("module.QualName"), which is also its type tag
+reflected_classes: Dict[str, RegisteredClass] = {}
+
+# Method each decorator adds, and the per-module name lists it used to be recorded in
+_FORMAT_METHODS = {'json': 'to_json', 'dict': 'to_dict', 'xml': 'to_xml', 'yaml': 'to_yaml', 'pack': 'to_bytes'}
+_FORMAT_INDEXES = {'json': jsonized_classes, 'dict': dictized_classes, 'xml': xmlized_classes,
+                   'yaml': yamlized_classes, 'pack': packized_classes}
+
+
+def _qualified_name(cls: Type) -> str:
+    """The registry key and type tag of a class."""
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _register(cls: Type, format: Optional[str] = None) -> str:
+    """
+    Record cls in reflected_classes, with format if given, and return its qualified name.
+    A class replacing an entry of the same name, such as one rebuilt with slots by an outer
+    decorator, or an undecorated subclass keeps the formats whose methods it still has.
+    """
+    name = _qualified_name(cls)
+    entry = reflected_classes.get(name)
+    if entry is None or entry.cls is not cls:
+        formats = set(entry.formats) if entry is not None else set()
+        for base in cls.__mro__[1:]:
+            registered = reflected_classes.get(_qualified_name(base))
+            if registered is not None and registered.cls is base:
+                formats |= registered.formats
+        entry = reflected_classes[name] = RegisteredClass(
+            cls, {known for known in formats if hasattr(cls, _FORMAT_METHODS[known])})
+    if format is not None:
+        entry.formats.add(format)
+        _FORMAT_INDEXES[format].setdefault(cls.__module__, []).append(cls.__name__)
+    return name
+
+
+def loads(data: Any, format: str = 'json', lazy: bool = False, fields: Optional[Iterable[str]] = None) -> Any:
+    """
+    Build an instance of the class named by the type tag of a document written with
+    tagged=True, so streams mixing several classes need no dispatching code.
+
+    Args:
+        data (Any): A JSON or YAML string or bytes, or an already parsed dictionary.
+        format (str): 'json', 'yaml' or 'dict'.
+        lazy (bool): If True, return a lazy proxy as from_dict does.
+        fields (Optional[Iterable[str]]): Names of the fields to keep, for a projected proxy.
+
+    Returns:
+        Any: The rebuilt instance.
+
+    Raises:
+        ValueError: If format is unknown, the document has no type tag or the tag names no registered class.
+    """
+    if format not in ('json', 'yaml', 'dict'):
+        raise ValueError(f"Unknown format: {format!r}, expected 'json', 'yaml' or 'dict'")
+    if format == 'dict':
+        tag = data.get(_TYPE_TAG) if isinstance(data, dict) else None
+    else:
+        # The parsed document is ours, so the tag can be removed in place
+        data = (_active_backends.get(format) or get_backend(format)).loads(data)
+        tag = data.pop(_TYPE_TAG, None) if isinstance(data, dict) else None
+    entry = reflected_classes.get(tag) if isinstance(tag, str) else None
+    if entry is None:
+        raise ValueError(f"Unknown type tag: {tag!r}" if tag is not None else f"Document has no {_TYPE_TAG!r} tag")
+    spec = _get_spec(entry.cls)
+    if lazy or fields is not None:
+        return spec.load_lazy(data, fields)
+    return spec.load(data, {})
+
+
+def _batches(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most size items without materializing it."""
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _write_text(fp: IO[Any], text: str) -> None:
+    """Write text to a text or binary file object, encoding it as UTF-8 for the latter."""
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(fp, 'mode', ''):
+        fp.write(text.encode('utf-8'))
+    else:
+        fp.write(text)
+
+
+def _element_to_value(element: ElementTree.Element) -> Any:
+    """Convert an element to the value xmltodict would produce for it."""
+    text = (element.text or '').strip() or None
+    if not len(element) and not element.attrib:
+        return text
+
+    result: Dict[str, Any] = {f'@{key}': value for key, value in element.attrib.items()}
+    for child in element:
+        value = _element_to_value(child)
+        if child.tag not in result:
+            result[child.tag] = value
+        elif isinstance(result[child.tag], list):
+            result[child.tag].append(value)
+        else:
+            result[child.tag] = [result[child.tag], value]
+    if text is not None:
+        result['#text'] = text
+    return result
+
+
+def _iter_elements(source: Union[str, os.PathLike, IO[Any]], tag: str) -> Iterator[ElementTree.Element]:
+    """
+    Incrementally parse source and yield every complete element named tag. Each element
+    is detached from its parent once consumed, so memory does not grow with the document.
+    """
+    open_elements: List[ElementTree.Element] = []
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(element)
+            continue
+        open_elements.pop()
+        if element.tag == tag:
+            yield element
+            if open_elements:
+                open_elements[-1].remove(element)
+            element.clear()
+
+
+# struct codes accepted per Python type; the first one is used when no code is given
+_PACK_CODES: Dict[type, str] = {int: 'qbBhHiIlLQ', float: 'def', bool: '?'}
+_BYTE_ORDERS = ('<', '>', '!', '=')
+
+
+def _pack_code(name: str, hint: Any) -> Tuple[str, Optional[type]]:
+    """
+    struct code of one field, and the text type needing encoding for str fields. Plain
+    int, float and bool use 'q', 'd' and '?'; Annotated[int, 'i'] picks another code, and
+    Annotated[bytes, n] or Annotated[str, n] a fixed-width field of n bytes.
+    """
+    base, extras = hint, ()
+    if typing.get_origin(hint) is typing.Annotated:
+        base, *extras = typing.get_args(hint)
+    if base in (bytes, str):
+        if len(extras) != 1 or not isinstance(extras[0], int):
+            raise TypeError(f"Field {name!r}: {base.__name__} needs a width, e.g. Annotated[{base.__name__}, 16]")
+        return f"{extras[0]}s", base
+    if base not in _PACK_CODES:
+        raise TypeError(f"Field {name!r}: cannot pack {hint!r}, expected int, float, bool, "
+                        f"or Annotated[bytes | str, width]")
+    code = extras[0] if extras else _PACK_CODES[base][0]
+    if not isinstance(code, str) or code not in _PACK_CODES[base]:
+        raise TypeError(f"Field {name!r}: {code!r} is not a struct code for {base.__name__}, "
+                        f"expected one of {tuple(_PACK_CODES[base])}")
+    return code, None
+
+
+class _PackLayout:
+    """
+    Fixed binary layout of a class, generated once from its type hints.
+
+    Attributes:
+        struct (struct.Struct): The record format, without padding.
+        size (int): Bytes per record.
+        pack_into (Callable[[Any, int, Any], None]): Writes an instance into a buffer at an offset,
+            raising ValueError if a bytes or str field is wider than its width.
+        unpack_from (Callable[[Any, int], Any]): Builds an instance from a buffer at an offset,
+            stripping trailing NUL bytes from bytes and str fields.
+        make (Callable[[tuple], Any]): Builds an instance from a tuple of unpacked values.
+    """
+
+    __slots__ = ('struct', 'size', 'pack_into', 'unpack_from', 'make')
+
+    def __init__(self, cls: Type, fields: Tuple[str, ...], byteorder: str) -> None:
+        if byteorder not in _BYTE_ORDERS:
+            raise ValueError(f"byteorder must be one of {_BYTE_ORDERS}, not {byteorder!r}")
+        hints = _field_types(cls, fields, include_extras=True)
+        missing = [name for name in fields if name not in hints]
+        if not fields or missing:
+            raise TypeError(f"Packize needs a type hint for every field of {cls.__qualname__}, missing: {missing}")
+
+        codes = [_pack_code(name, hints[name]) for name in fields]
+        self.struct = struct.Struct(byteorder + ''.join(code for code, _ in codes))
+        self.size = self.struct.size
+
+        positional = _takes_fields_positionally(cls, fields)
+
+        values = [f"v{i}" for i in range(len(fields))]
+        packed, checks = [], []
+        for name, value, (code, text) in zip(fields, values, codes):
+            if text is None:
+                packed.append(f"self.{name}")
+                continue
+            # struct pads short strings but silently truncates long ones, possibly mid-character
+            width = int(code[:-1])
+            checks.append(f"    {value} = self.{name}" + (".encode('utf-8')\n" if text is str else "\n"))
+            checks.append(f"    if len({value}) > {width}:\n"
+                          f"        raise ValueError(f\"Field {name!r} is {{len({value})}} bytes, "
+                          f"wider than {width}\")\n")
+            packed.append(value)
+        arguments = []
+        for name, value, (_, text) in zip(fields, values, codes):
+            if text is not None:
+                value += ".rstrip(b'\\0')" + (".decode('utf-8')" if text is str else '')
+            arguments.append(value if positional else f"{name}={value}")
+        built = ', '.join(arguments)
+        unpacked = ', '.join(values) + ','
+        source = (
+            "def pack_into(buffer, offset, self):\n"
+            + ''.join(checks)
+            + f"    _pack_into(buffer, offset, {', '.join(packed)})\n"
+            "def make(values):\n"
+            f"    {unpacked} = values\n"
+            f"    return cls({built})\n"
+            "def unpack_from(buffer, offset=0):\n"
+            f"    {unpacked} = _unpack_from(buffer, offset)\n"
+            f"    return cls({built})\n"
+        )
+        namespace: Dict[str, Any] = {'cls': cls, '_pack_into': self.struct.pack_into,
+                                     '_unpack_from': self.struct.unpack_from}
+        exec(compile(source, f"<packize layout {cls.__qualname__}>", 'exec'), namespace)
+        self.pack_into = namespace['pack_into']
+        self.unpack_from = namespace['unpack_from']
+        self.make = namespace['make']
+
+
+class PackedRecords(Sequence):
+    """
+    Read-only sequence of records decoded lazily from a buffer of packed records.
+
+    The buffer (bytes, bytearray, memoryview, mmap, ...) is wrapped in a memoryview and never
+    copied; a record is decoded only when it is indexed or iterated over, and slicing returns
+    another view over the same memory.
+    """
+
+    def __init__(self, cls: Type, layout: _PackLayout, buffer: Any) -> None:
+        view = memoryview(buffer).cast('B')
+        if len(view) % layout.size:
+            raise ValueError(f"Buffer of {len(view)} bytes is not a whole number of "
+                             f"{layout.size}-byte {cls.__qualname__} records")
+        self.cls = cls
+        self.layout = layout
+        self.buffer = view
+
+    def __len__(self) -> int:
+        return len(self.buffer) // self.layout.size
+
+    def __getitem__(self, index: Any) -> Any:
+        size = self.layout.size
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return PackedRecords(self.cls, self.layout, self.buffer[start * size:max(start, stop) * size])
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("PackedRecords index out of range")
+        return self.layout.unpack_from(self.buffer, index * size)
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.layout.make, self.layout.struct.iter_unpack(self.buffer))
+
+    def __repr__(self) -> str:
+        return f"<PackedRecords of {len(self)} {self.cls.__qualname__} records>"
+
+
+def Jsonize(cls: Optional[Type] = None, *, slots: bool = False, backend: Optional[str] = None) -> Any:
     """
     Class decorator to add methods to convert the instance to a JSON string
     and to create an instance from a JSON string.
 
+    Can be used with or without parameters.
+
     Args:
-        cls (Type): The class to be decorated.
+        cls (Optional[Type]): The class to be decorated.
+        slots (bool): If True, rebuild the class with __slots__ for its annotated fields.
+        backend (Optional[str]): Name of the JSON backend for this class. If None, the
+            default backend at call time is used.
 
     Returns:
-        Type: The decorated class with to_json and from_json methods.
+        Any: The decorated class with to_json, from_json, dump_jsonl and load_jsonl methods,
+            or a decorator if cls is not given.
     """
-    original_init = cast(Callable[..., None], cls.__init__)
+    if cls is None:
+        return functools.partial(Jsonize, slots=slots, backend=backend)
+    if slots:
+        cls = _make_slotted(cls)
+
+    plain = _get_spec(cls).plain
+    fixed_backend = get_backend('json', backend) if backend is not None else None
 
-    @wraps(original_init)
-    def new_init(self, *args: Any, **kwargs: Any) -> None:
-        original_init(self, *args, **kwargs)
+    def to_json(self: Any, shared: bool = False, tagged: bool = False) -> str:
+        return (fixed_backend or _active_backends['json']).dumps(plain(self, shared, tagged))
 
-    def to_json(self: Any) -> str:
-        return json.dumps({k: v for k, v in self.__dict__.items() if not callable(v)})
+    def from_json(__cls: Type, json_str: str, lazy: bool = False, fields: Optional[Iterable[str]] = None) -> Any:
+        data = (fixed_backend or _active_backends['json']).loads(json_str)
+        if lazy or fields is not None:
+            return _get_spec(__cls).load_lazy(data, fields)
+        return _get_spec(__cls).load(data, {})
 
-    def from_json(__cls: Type, json_str: str) -> Any:
-        data = json.loads(json_str)
-        return __cls(**data)
+    def dump_jsonl(__cls: Type, instances: Iterable[Any], fp: IO[Any], batch_size: int = 1000) -> int:
+        dumps = (fixed_backend or _active_backends['json']).dumps
+        count = 0
+        for batch in _batches(instances, batch_size):
+            _write_text(fp, ''.join([dumps(plain(instance)) + '\n' for instance in batch]))
+            count += len(batch)
+        return count
+
+    def load_jsonl(__cls: Type, fp: IO[Any]) -> Iterator[Any]:
+        loads = (fixed_backend or _active_backends['json']).loads
+        load = _get_spec(__cls).load
+        for line in fp:
+            if line.strip():
+                yield load(loads(line), {})
 
     setattr(cls, 'to_json', to_json)
     setattr(cls, 'from_json', classmethod(cast(Callable[..., Any], from_json)))
-    cls.__init__ = cast(Callable[..., None], new_init)
+    setattr(cls, 'dump_jsonl', classmethod(cast(Callable[..., Any], dump_jsonl)))
+    setattr(cls, 'load_jsonl', classmethod(cast(Callable[..., Any], load_jsonl)))
 
     # Record the decorated class
-    module_name = cls.__module__
-    if module_name not in jsonized_classes:
-        jsonized_classes[module_name] = []
-    jsonized_classes[module_name].append(cls.__name__)
+    _register(cls, 'json')
 
     return cls
 
 
-def Dictize(cls: Type) -> Type:
+def Dictize(cls: Optional[Type] = None, *, slots: bool = False) -> Any:
     """
     Class decorator to add methods to convert the instance to a dictionary
     and to create an instance from a dictionary.
 
+    Can be used with or without parameters.
+
     Args:
-        cls (Type): The class to be decorated.
+        cls (Optional[Type]): The class to be decorated.
+        slots (bool): If True, rebuild the class with __slots__ for its annotated fields.
 
     Returns:
-        Type: The decorated class with to_dict and from_dict methods.
+        Any: The decorated class with to_dict, from_dict, to_columns and from_columns methods,
+            or a decorator if cls is not given.
     """
-    original_init = cast(Callable[..., None], cls.__init__)
+    if cls is None:
+        return functools.partial(Dictize, slots=slots)
+    if slots:
+        cls = _make_slotted(cls)
 
-    @wraps(original_init)
-    def new_init(self, *args: Any, **kwargs: Any) -> None:
-        original_init(self, *args, **kwargs)
+    # The generated to_dict is installed as it is, without a wrapper call
+    to_dict = _get_spec(cls).plain
 
-    def to_dict(self: Any) -> dict:
-        return {k: v for k, v in self.__dict__.items() if not callable(v)}
+    def from_dict(__cls: Type, data: dict, lazy: bool = False, fields: Optional[Iterable[str]] = None) -> Any:
+        if lazy or fields is not None:
+            return _get_spec(__cls).load_lazy(data, fields)
+        return _get_spec(__cls).load(data, {})
 
-    def from_dict(__cls: Type, data: dict) -> Any:
-        return __cls(**data)
+    def to_columns(__cls: Type, instances: Iterable[Any], kind: str = 'list') -> Dict[str, Any]:
+        return _get_spec(__cls).columns.to_columns(instances, kind)
+
+    def from_columns(__cls: Type, columns: Dict[str, Any]) -> List[Any]:
+        return _get_spec(__cls).columns.from_columns(columns)
 
     setattr(cls, 'to_dict', to_dict)
     setattr(cls, 'from_dict', classmethod(cast(Callable[..., Any], from_dict)))
-    cls.__init__ = cast(Callable[..., None], new_init)
+    setattr(cls, 'to_columns', classmethod(cast(Callable[..., Any], to_columns)))
+    setattr(cls, 'from_columns', classmethod(cast(Callable[..., Any], from_columns)))
 
     # Record the decorated class
-    module_name = cls.__module__
-    if module_name not in dictized_classes:
-        dictized_classes[module_name] = []
-    dictized_classes[module_name].append(cls.__name__)
+    _register(cls, 'dict')
 
     return cls
 
-def XMLize(cls: Type) -> Type:
+def XMLize(cls: Optional[Type] = None, *, slots: bool = False) -> Any:
     """
     Class decorator to add methods to convert the instance to an XML string
     and to create an instance from an XML string.
 
+    Can be used with or without parameters.
+
     Args:
-        cls (Type): The class to be decorated.
+        cls (Optional[Type]): The class to be decorated.
+        slots (bool): If True, rebuild the class with __slots__ for its annotated fields.
 
     Returns:
-        Type: The decorated class with to_xml and from_xml methods.
+        Any: The decorated class with to_xml, from_xml and iter_xml methods,
+            or a decorator if cls is not given.
     """
-    original_init = cast(Callable[..., None], cls.__init__)
+    if cls is None:
+        return functools.partial(XMLize, slots=slots)
+    if slots:
+        cls = _make_slotted(cls)
 
-    @wraps(original_init)
-    def new_init(self, *args: Any, **kwargs: Any) -> None:
-        original_init(self, *args, **kwargs)
+    plain = _get_spec(cls).plain
 
     def to_xml(self: Any) -> str:
-        return xmltodict.unparse({cls.__name__: self.__dict__}, pretty=True)
+        return xmltodict.unparse({cls.__name__: plain(self)}, pretty=True)
 
     def from_xml(__cls: Type, xml_str: str) -> Any:
         data = xmltodict.parse(xml_str)[cls.__name__]
-        return __cls(**data)
+        return __cls(**_get_spec(__cls).coerce_text(data))
+
+    def iter_xml(__cls: Type, source: Union[str, os.PathLike, IO[Any]], tag: Optional[str] = None) -> Iterator[Any]:
+        coerce_text = _get_spec(__cls).coerce_text
+        for element in _iter_elements(source, tag or cls.__name__):
+            yield __cls(**coerce_text(_element_to_value(element) or {}))
 
     setattr(cls, 'to_xml', to_xml)
     setattr(cls, 'from_xml', classmethod(cast(Callable[..., Any], from_xml)))
-    cls.__init__ = cast(Callable[..., None], new_init)
+    setattr(cls, 'iter_xml', classmethod(cast(Callable[..., Any], iter_xml)))
 
     # Record the decorated class
-    module_name = cls.__module__
-    if module_name not in xmlized_classes:
-        xmlized_classes[module_name] = []
-    xmlized_classes[module_name].append(cls.__name__)
+    _register(cls, 'xml')
 
     return cls
 
 
-def YAMLize(cls: Type) -> Type:
+def YAMLize(cls: Optional[Type] = None, *, slots: bool = False, backend: Optional[str] = None) -> Any:
     """
     Class decorator to add methods to convert the instance to a YAML string
     and to create an instance from a YAML string.
 
+    Can be used with or without parameters.
+
     Args:
-        cls (Type): The class to be decorated.
+        cls (Optional[Type]): The class to be decorated.
+        slots (bool): If True, rebuild the class with __slots__ for its annotated fields.
+        backend (Optional[str]): Name of the YAML backend for this class. If None, the
+            default backend at call time is used.
 
     Returns:
-        Type: The decorated class with to_yaml and from_yaml methods.
+        Any: The decorated class with to_yaml, from_yaml, dump_yaml_all and load_yaml_all methods,
+            or a decorator if cls is not given.
     """
-    original_init = cast(Callable[..., None], cls.__init__)
+    if cls is None:
+        return functools.partial(YAMLize, slots=slots, backend=backend)
+    if slots:
+        cls = _make_slotted(cls)
 
-    @wraps(original_init)
-    def new_init(self, *args: Any, **kwargs: Any) -> None:
-        original_init(self, *args, **kwargs)
+    plain = _get_spec(cls).plain
+    fixed_backend = get_backend('yaml', backend) if backend is not None else None
 
-    def to_yaml(self: Any) -> str:
-        return yaml.dump(self.__dict__)
+    def to_yaml(self: Any, shared: bool = False, tagged: bool = False) -> str:
+        return (fixed_backend or _active_backends['yaml']).dumps(plain(self, shared, tagged))
 
     def from_yaml(__cls: Type, yaml_str: str) -> Any:
-        data = yaml.safe_load(yaml_str)
-        return __cls(**data)
+        data = (fixed_backend or _active_backends['yaml']).loads(yaml_str)
+        return _get_spec(__cls).load(data, {})
+
+    def dump_yaml_all(__cls: Type, instances: Iterable[Any], fp: IO[Any], batch_size: int = 1000) -> int:
+        dump_all = (fixed_backend or _active_backends['yaml']).dump_all
+        count = 0
+        for batch in _batches(instances, batch_size):
+            _write_text(fp, dump_all([plain(instance) for instance in batch]))
+            count += len(batch)
+        return count
+
+    def load_yaml_all(__cls: Type, fp: IO[Any]) -> Iterator[Any]:
+        load = _get_spec(__cls).load
+        for data in (fixed_backend or _active_backends['yaml']).load_all(fp):
+            if data is not None:
+                yield load(data, {})
 
     setattr(cls, 'to_yaml', to_yaml)
     setattr(cls, 'from_yaml', classmethod(cast(Callable[..., Any], from_yaml)))
-    cls.__init__ = cast(Callable[..., None], new_init)
+    setattr(cls, 'dump_yaml_all', classmethod(cast(Callable[..., Any], dump_yaml_all)))
+    setattr(cls, 'load_yaml_all', classmethod(cast(Callable[..., Any], load_yaml_all)))
+
+    # Record the decorated class
+    _register(cls, 'yaml')
+
+    return cls
+
+
+def Packize(cls: Optional[Type] = None, *, slots: bool = False, byteorder: str = '<') -> Any:
+    """
+    Class decorator to add methods to convert the instance to and from a fixed-size binary
+    record, with a layout built from the type hints of its fields by the struct module.
+
+    Can be used with or without parameters.
+
+    Args:
+        cls (Optional[Type]): The class to be decorated.
+        slots (bool): If True, rebuild the class with __slots__ for its annotated fields.
+        byteorder (str): struct byte order prefix, '<' (little-endian) by default.
+
+    Returns:
+        Any: The decorated class with to_bytes, from_bytes, pack_many and unpack_many methods,
+            or a decorator if cls is not given.
+
+    Raises:
+        TypeError: If a field has no type hint or one that cannot be packed.
+    """
+    if cls is None:
+        return functools.partial(Packize, slots=slots, byteorder=byteorder)
+    if slots:
+        cls = _make_slotted(cls)
+
+    layout = _PackLayout(cls, _get_spec(cls).fields, byteorder)
+    pack_into, size = layout.pack_into, layout.size
+
+    def to_bytes(self: Any) -> bytes:
+        buffer = bytearray(size)
+        pack_into(buffer, 0, self)
+        return bytes(buffer)
+
+    def from_bytes(__cls: Type, data: Any) -> Any:
+        return layout.unpack_from(data, 0)
+
+    def pack_many(__cls: Type, instances: Iterable[Any]) -> bytearray:
+        items = instances if isinstance(instances, (list, tuple)) else list(instances)
+        buffer = bytearray(len(items) * size)
+        offset = 0
+        for instance in items:
+            pack_into(buffer, offset, instance)
+            offset += size
+        return buffer
+
+    def unpack_many(__cls: Type, buffer: Any) -> PackedRecords:
+        return PackedRecords(cls, layout, buffer)
+
+    setattr(cls, 'to_bytes', to_bytes)
+    setattr(cls, 'from_bytes', classmethod(cast(Callable[..., Any], from_bytes)))
+    setattr(cls, 'pack_many', classmethod(cast(Callable[..., Any], pack_many)))
+    setattr(cls, 'unpack_many', classmethod(cast(Callable[..., Any], unpack_many)))
+    setattr(cls, 'record_size', size)
 
     # Record the decorated class
-    module_name = cls.__module__
-    if module_name not in yamlized_classes:
-        yamlized_classes[module_name] = []
-    yamlized_classes[module_name].append(cls.__name__)
+    _register(cls, 'pack')
 
     return cls
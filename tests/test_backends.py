@@ -0,0 +1,95 @@
+# tests/test_backends.py
+#
+# Cross-backend consistency of the JSON and YAML backends that are importable here: every
+# backend must read every other backend's output back to the original payload, NaN and
+# infinities included, and every JSON backend must reject the values json rejects.
+
+import datetime
+import json
+
+import pytest
+
+from jh_decorators.reflection import Jsonize, available_backends, get_backend, set_backend
+
+PAYLOADS = [
+    {},
+    {'a': 1, 'b': 2},
+    {'int': -7, 'big': 2 ** 70, 'negative_big': -2 ** 64, 'float': 0.1, 'exp': 1e-300, 'true': True, 'none': None},
+    {'text': 'plain', 'unicode': 'naïve 漢字 🚀', 'escapes': 'tab\tquote"slash/\\back\nline'},
+    {'list': [1, 'two', 3.0, None, [4, [5]]], 'nested': {'x': {'y': {'z': []}}}},
+    {'nan': float('nan'), 'inf': float('inf'), 'ninf': [float('-inf'), None]},
+]
+
+# Values the json module cannot encode
+REJECTED = [
+    {'date': datetime.date(2024, 1, 1)},
+    {'datetime': datetime.datetime(2024, 1, 1, 12, 30)},
+    {'set': {1, 2}},
+]
+
+
+def same(parsed, payload) -> bool:
+    """Equality that also holds for NaN and tells 2 ** 70 from its float approximation."""
+    if type(parsed) is not type(payload):
+        return False
+    if isinstance(payload, dict):
+        return parsed.keys() == payload.keys() and all(same(parsed[key], payload[key]) for key in payload)
+    if isinstance(payload, list):
+        return len(parsed) == len(payload) and all(map(same, parsed, payload))
+    return parsed == payload or parsed != parsed and payload != payload
+
+
+def backend_pairs(format: str) -> list:
+    names = available_backends(format)
+    return [(writer, reader) for writer in names for reader in names]
+
+
+@pytest.fixture
+def default_json_backend():
+    name = get_backend('json').name
+    yield
+    set_backend('json', name)
+
+
+@pytest.mark.parametrize('format', ['json', 'yaml'])
+@pytest.mark.parametrize('payload', PAYLOADS, ids=range(len(PAYLOADS)))
+def test_every_backend_reads_every_other_backends_output(format, payload):
+    for writer, reader in backend_pairs(format):
+        text = get_backend(format, writer).dumps(payload)
+        parsed = get_backend(format, reader).loads(text)
+        assert same(parsed, payload), f"written by {writer}, read by {reader}: {parsed!r}"
+
+
+@pytest.mark.parametrize('payload', REJECTED, ids=['date', 'datetime', 'set'])
+@pytest.mark.parametrize('name', available_backends('json'))
+def test_json_backends_reject_what_json_rejects(name, payload):
+    with pytest.raises(TypeError):
+        get_backend('json', name).dumps(payload)
+
+
+def test_fastest_json_backend_is_the_default():
+    assert get_backend('json').name == available_backends('json')[0]
+
+
+def test_json_backend_gives_standard_output(default_json_backend):
+    @Jsonize
+    class Point:
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+    set_backend('json', 'json')
+    assert Point(1, 'é').to_json() == json.dumps({'x': 1, 'y': 'é'})
+
+
+@pytest.mark.parametrize('name', available_backends('json'))
+def test_to_json_round_trips_through_every_backend(name):
+    @Jsonize(backend=name)
+    class Record:
+        def __init__(self, id, price, tags):
+            self.id = id
+            self.price = price
+            self.tags = tags
+
+    record = Record.from_json(Record(2 ** 70, float('inf'), ['a', None]).to_json())
+    assert (record.id, record.price, record.tags) == (2 ** 70, float('inf'), ['a', None])